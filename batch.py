@@ -0,0 +1,126 @@
+#This file is the command line entry point for making lots of mazes at once, no Tk window needed.
+#Every maze gets its own seed and is generated in a worker process, so all cores stay busy.
+#Mazes (and their PNGs) are cached under maze_exports/cache, so running the same command again mostly copies files.
+#Usage:
+#   python batch.py --count 100 --sizes 50x50 200x100 --reach 25 --bias 30 --out batch_exports
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import CACHE_DIR, MazeCache
+from generator import MazeGenerator
+from load import export_maze_to_csv
+from pngstream import MODES
+from render import export_maze_image, export_maze_png_streaming
+
+_cache = None  # One per worker process; they share the disk tier
+
+def _worker_cache(cache_dir):
+    global _cache
+    if _cache is None or _cache.cache_dir != cache_dir:
+        _cache = MazeCache(cache_dir=cache_dir)
+    return _cache
+
+def produce_maze(job):
+    """
+    Generates one maze (or takes it from the cache) and writes its CSV (and PNG) into the output directory.
+    Runs inside a worker process.
+
+    :param job: (width, height, reach, bias, seed, out_dir, cell_size, max_dimension, png_mode, cache_dir);
+                cell_size 0 skips the PNG, a png_mode streams it with that mode, cache_dir None skips the cache
+    :return: (number of edges carved, whether the maze came from the cache)
+    """
+    width, height, reach, bias, seed, out_dir, cell_size, max_dimension, png_mode, cache_dir = job
+    cache = _worker_cache(cache_dir) if cache_dir else None
+    key = MazeCache.key(width, height, reach, bias, seed)
+    maze = cache.get(key) if cache else None
+    hit = maze is not None
+    if maze is None:
+        maze = MazeGenerator(width, height, reach, bias, seed)
+        maze.generate()
+
+    name = f"maze_{width}x{height}_{seed}"
+    export_maze_to_csv(maze, name + ".csv", export_dir=out_dir)
+    png_file = os.path.join(out_dir, name + ".png")
+    settings = ("batch", cell_size, max_dimension, png_mode)
+    png = cache.get_png(key, settings) if cache and cell_size and hit else None
+    if png is not None:
+        with open(png_file, 'wb') as f:
+            f.write(png)
+    elif cell_size and png_mode:
+        export_maze_png_streaming(maze.grid, png_file, cell_size, max_dimension, png_mode)
+    elif cell_size:
+        files = export_maze_image(maze.grid, png_file, cell_size, max_dimension)
+        if files != [png_file]:
+            png_file = None  # Split into tiles, which the cache doesn't keep
+    if cache:
+        new_png = None
+        if cell_size and png is None and png_file:
+            with open(png_file, 'rb') as f:
+                new_png = f.read()
+        if not hit or new_png is not None:
+            cache.put(key, maze.grid, seed, new_png, settings)
+    return maze.grid.edge_count(), hit
+
+def parse_size(text):
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Sizes look like 50x50, not {text!r}")
+    return width, height
+
+def build_jobs(args):
+    # Seeds come from one seeded stream, so the same command line makes the same mazes
+    seeds = random.Random(args.seed)
+    return [
+        (width, height, args.reach, args.bias, seeds.randrange(2**32), args.out,
+         0 if args.no_png else args.cell_size, args.max_dimension, args.png_mode,
+         None if args.no_cache else args.cache_dir)
+        for width, height in args.sizes
+        for _ in range(args.count)
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate many mazes in parallel and export them as CSV/PNG.")
+    parser.add_argument("--count", type=int, default=10, help="Mazes to make for each size")
+    parser.add_argument("--sizes", type=parse_size, nargs="+", default=[(10, 10)], help="Sizes such as 50x50")
+    parser.add_argument("--reach", type=float, default=25, help="Reach (%%)")
+    parser.add_argument("--bias", type=float, default=0, help="Parallel bias (%%)")
+    parser.add_argument("--seed", type=int, default=None, help="Base seed; each maze's seed is drawn from it")
+    parser.add_argument("--out", default="./maze_exports/batch", help="Output directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (defaults to the CPU count)")
+    parser.add_argument("--cell-size", type=int, default=20, help="Pixels per cell in the PNGs")
+    parser.add_argument("--max-dimension", type=int, default=None,
+                        help="Shrink the cells so no PNG side is longer than this many pixels")
+    parser.add_argument("--png-mode", choices=MODES, default=None,
+                        help="Stream each PNG strip by strip in this mode (needs NumPy); palette and 1bit are smaller")
+    parser.add_argument("--no-png", action="store_true", help="Only write CSVs")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Where generated mazes and PNGs are cached")
+    parser.add_argument("--no-cache", action="store_true", help="Always generate, and don't fill the cache")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    jobs = build_jobs(args)
+
+    start = time.perf_counter()
+    edges = hits = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        # Small mazes finish quickly, so hand them out in chunks to keep the workers fed
+        chunksize = max(1, len(jobs) // (4 * (args.workers or os.cpu_count() or 1)))
+        for edge_count, hit in executor.map(produce_maze, jobs, chunksize=chunksize):
+            edges += edge_count
+            hits += hit
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {len(jobs)} mazes ({edges} edges) to {args.out} in {elapsed:.2f}s: "
+          f"{len(jobs) / elapsed:.1f} mazes/s")
+    if not args.no_cache:
+        print(f"Maze cache: {hits} of {len(jobs)} mazes were already cached in {args.cache_dir}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
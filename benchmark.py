@@ -0,0 +1,186 @@
+#This file is the benchmark harness. It never opens a Tk window, so it can run on a build host.
+#Each case runs in its own process so the peak RSS belongs to that case alone.
+#Usage:
+#   python benchmark.py --output bench.json
+#   python benchmark.py --sizes 10 100 --compare bench.json
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from generator import MazeGenerator
+from load import MappedMazeGraph, export_maze_to_binary, export_maze_to_csv, read_maze_binary
+from render import render_maze_image
+from solver import SOLVERS, BreadthFirstSolver
+
+DEFAULT_SIZES = [10, 32, 100, 316, 1000]  # 10^2 to 10^6 cells
+BENCH_CELL_WIDTH = 20
+
+def _generate(params):
+    generator = MazeGenerator(params["width"], params["height"], params["reach"], params["bias"], params["seed"])
+    generator.generate()
+    return generator
+
+def _exported_csv(params):
+    return export_maze_to_csv(_generate(params), "bench.csv")
+
+def _setup(op, params):
+    """Builds what an operation needs; none of this is timed. Returns the timed callable."""
+    if op == "generate":
+        return lambda: _generate(params)
+    if op == "export_csv":
+        generator = _generate(params)
+        return lambda: export_maze_to_csv(generator, "bench.csv")
+    if op == "export_binary":
+        generator = _generate(params)
+        return lambda: export_maze_to_binary(generator, "bench.maze", ".")
+    if op == "render_image":
+        generator = _generate(params)
+        return lambda: render_maze_image(generator.grid, BENCH_CELL_WIDTH)
+    if op == "render_image_pil":
+        generator = _generate(params)
+        return lambda: render_maze_image(generator.grid, BENCH_CELL_WIDTH, renderer="pil")
+    if op == "save_image":
+        image = render_maze_image(_generate(params).grid, BENCH_CELL_WIDTH)
+        return lambda: image.save_image("bench.png")
+    if op == "parse_csv":
+        csv_file = _exported_csv(params)
+        solver = BreadthFirstSolver(None, csv_file, None)
+        return lambda: solver._parse_csv(csv_file)
+    if op == "parse_binary":
+        binary_file = export_maze_to_binary(_generate(params), "bench.maze", ".")
+        return lambda: read_maze_binary(binary_file)
+    if op == "map_binary":
+        binary_file = export_maze_to_binary(_generate(params), "bench.maze", ".", csr=True)
+        return lambda: MappedMazeGraph(binary_file).close()
+    if op.startswith("solve_mapped_") and op[len("solve_mapped_"):] in SOLVERS:
+        # The graph stays mapped for the rest of this worker process
+        binary_file = export_maze_to_binary(_generate(params), "bench.maze", ".", csr=True)
+        solver = SOLVERS[op[len("solve_mapped_"):]](None, binary_file, None, MappedMazeGraph(binary_file))
+        return solver.solve
+    if op.startswith("solve_") and op[len("solve_"):] in SOLVERS:
+        solver = SOLVERS[op[len("solve_"):]](None, _exported_csv(params), None)
+        return solver.solve
+    raise ValueError(f"Unknown benchmark operation: {op}")
+
+def _run_case(case):
+    """Runs inside a fresh worker process. Returns the measurements for one case."""
+    op, params, repeat, measure_alloc = case["op"], case["params"], case["repeat"], case["alloc"]
+    result = {"op": op, "params": params}
+    home = os.getcwd()
+
+    # Exports land in a scratch directory that is removed afterwards
+    with tempfile.TemporaryDirectory(prefix="maze_bench_") as workdir:
+        os.chdir(workdir)
+        try:
+            timings = []
+            for _ in range(repeat):
+                func = _setup(op, params)
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+
+            if measure_alloc:
+                func = _setup(op, params)
+                tracemalloc.start()
+                func()
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                result["alloc_peak_kb"] = peak // 1024
+                result["alloc_blocks"] = sum(stat.count for stat in snapshot.statistics("filename"))
+        finally:
+            os.chdir(home)
+
+    result["wall_s"] = min(timings)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["peak_rss_kb"] = peak_rss // 1024 if sys.platform == "darwin" else peak_rss
+    return result
+
+def case_key(result):
+    params = result["params"]
+    return f'{result["op"]} {params["width"]}x{params["height"]} reach={params["reach"]} bias={params["bias"]}'
+
+def build_cases(args):
+    cases = []
+    for size in args.sizes:
+        for reach in args.reach:
+            for bias in args.bias:
+                params = {"width": size, "height": size, "reach": reach, "bias": bias, "seed": args.seed}
+                for op in args.ops:
+                    # Everything but generation only depends on the maze, so it runs for the first reach/bias only
+                    if op != "generate" and (reach != args.reach[0] or bias != args.bias[0]):
+                        continue
+                    cases.append({"op": op, "params": params, "repeat": args.repeat, "alloc": not args.no_alloc})
+    return cases
+
+def run(cases):
+    results = []
+    # maxtasksperchild=1 gives every case a clean process, so ru_maxrss is per case
+    with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+        for result in pool.imap(_run_case, cases):
+            print(f'{case_key(result):<45} {result["wall_s"]:>10.4f}s {result["peak_rss_kb"]:>10} KB RSS')
+            results.append(result)
+    return results
+
+def compare(results, baseline_file, threshold):
+    """
+    Prints the time ratio against a saved baseline for every case present in both.
+
+    :return: True if no case got slower than the threshold ratio
+    """
+    with open(baseline_file) as f:
+        baseline = {case_key(result): result for result in json.load(f)["results"]}
+
+    ok = True
+    print(f'\n{"case":<45} {"baseline":>10} {"now":>10} {"ratio":>7}')
+    for result in results:
+        key = case_key(result)
+        if key not in baseline:
+            continue
+        old, new = baseline[key]["wall_s"], result["wall_s"]
+        ratio = new / old if old else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{key:<45} {old:>10.4f} {new:>10.4f} {ratio:>7.2f}{flag}")
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time maze generation, export, import and solving without Tk.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Maze side lengths")
+    parser.add_argument("--reach", type=float, nargs="+", default=[25, 100], help="Reach percentages")
+    parser.add_argument("--bias", type=float, nargs="+", default=[0, 100], help="Parallel bias percentages")
+    parser.add_argument("--ops", nargs="+", default=["generate", "export_csv", "export_binary", "render_image",
+                                                     "render_image_pil", "save_image", "parse_csv",
+                                                     "parse_binary", "map_binary"] +
+                                                    ["solve_" + name for name in SOLVERS] + ["solve_mapped_bfs"])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per case; the fastest is kept")
+    parser.add_argument("--no-alloc", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio that counts as a regression in --compare mode")
+    args = parser.parse_args(argv)
+
+    results = run(build_cases(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": sys.version, "platform": platform.platform(), "results": results}, f, indent=2)
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#This file remembers generated mazes so asking for the same settings again doesn't mean generating again.
+#A seed always gives the same maze, so (width, height, reach, bias, seed) is the whole key.
+#Two tiers: an LRU in memory, bounded by entry count and bytes, and files under maze_exports/cache
+#(the binary .maze format plus prerendered PNGs) that outlive the process and are shared by batch workers.
+
+import hashlib
+import io
+import os
+from collections import OrderedDict
+from PIL import Image
+from load import MazeImage, export_maze_to_binary, read_maze_grid
+
+CACHE_DIR = './maze_exports/cache'
+CACHE_VERSION = 1  # Bump whenever a seed would start producing a different maze
+RESCAN_EVERY = 256  # Puts between directory scans; other processes write there too, so the running total drifts
+
+class CachedMaze:
+    def __init__(self, grid, seed):
+        """
+        A finished maze held by the cache. Treat the grid as read-only, it is shared by everyone who hits it.
+
+        :param grid: MazeGrid with the carved edges and endpoints
+        :param seed: Seed it was generated from
+        """
+        self.grid = grid
+        self.seed = seed
+        self.pngs = {}  # render settings -> PNG bytes
+
+    @property
+    def nbytes(self):
+        return 8 * self.grid.edge_count() + self.grid.size + sum(len(png) for png in self.pngs.values())
+
+class MazeCache:
+    def __init__(self, max_entries=64, max_bytes=256 * 2**20, cache_dir=CACHE_DIR, max_disk_bytes=2**30):
+        """
+        :param max_entries: Mazes kept in memory
+        :param max_bytes: Bytes (edges, visited flags and PNGs) kept in memory
+        :param cache_dir: Directory of the disk tier; None keeps everything in memory only
+        :param max_disk_bytes: Size the disk tier is pruned back to, oldest files first
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_bytes = None  # Running estimate of the disk tier's size, None until the first scan
+        self.puts_since_scan = 0
+
+        self.entries = OrderedDict()  # Least recently used first
+        self.sizes = {}  # key -> nbytes when it was last counted; entries grow in place when a PNG is added
+        self.total_bytes = 0
+        self.hits = self.disk_hits = self.misses = 0
+        self.png_hits = self.png_misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(width, height, reach, bias, seed):
+        # Sliders can hand over ints or floats; 25 and 25.0 must be the same maze
+        return int(width), int(height), float(reach), float(bias), int(seed)
+
+    @classmethod
+    def key_for(cls, generator):
+        return cls.key(generator.width, generator.height, generator.reach, generator.bias, generator.seed)
+
+    def _digest(self, *parts):
+        return hashlib.sha1(repr((CACHE_VERSION,) + parts).encode()).hexdigest()[:24]
+
+    def _maze_path(self, key):
+        return os.path.join(self.cache_dir, self._digest(*key) + ".maze")
+
+    def _png_path(self, key, settings):
+        return os.path.join(self.cache_dir, f"{self._digest(*key)}-{self._digest(*settings)}.png")
+
+    def get(self, key):
+        """
+        :param key: From MazeCache.key
+        :return: CachedMaze, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        if self.cache_dir is not None:
+            path = self._maze_path(key)
+            try:
+                grid, seed = read_maze_grid(path)
+            except (OSError, ValueError):
+                pass
+            else:
+                os.utime(path)
+                entry = CachedMaze(grid, seed)
+                self._remember(key, entry)
+                self.disk_hits += 1
+                return entry
+
+        self.misses += 1
+        return None
+
+    def get_png(self, key, settings):
+        """
+        :param settings: Tuple describing how the PNG was rendered (cell size, offsets, image size...)
+        :return: PNG bytes, or None if this maze was never cached with those settings
+        """
+        entry = self.entries.get(key)
+        png = entry.pngs.get(settings) if entry is not None else None
+        if png is None and self.cache_dir is not None:
+            try:
+                with open(self._png_path(key, settings), 'rb') as f:
+                    png = f.read()
+            except OSError:
+                pass
+            else:
+                if entry is not None:
+                    entry.pngs[settings] = png
+                    self._remember(key, entry)
+        if png is None:
+            self.png_misses += 1
+        else:
+            self.png_hits += 1
+        return png
+
+    def put(self, key, grid, seed, png=None, settings=None):
+        """
+        Stores a generated maze (and optionally one rendering of it) in both tiers.
+
+        :param png: PNG bytes to keep alongside, rendered with `settings`
+        :return: The CachedMaze
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = CachedMaze(grid, seed)
+        if png is not None:
+            entry.pngs[settings] = png
+        self._remember(key, entry)
+
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            written = 0
+            path = self._maze_path(key)
+            if not os.path.exists(path):
+                written += self._write_atomic(path, lambda temp: export_maze_to_binary(
+                    entry, os.path.basename(temp), self.cache_dir))
+            if png is not None:
+                written += self._write_atomic(self._png_path(key, settings), lambda temp: _write_bytes(temp, png))
+
+            self.puts_since_scan += 1
+            if self.disk_bytes is not None:
+                self.disk_bytes += written
+            if (self.disk_bytes is None or self.disk_bytes > self.max_disk_bytes
+                    or self.puts_since_scan >= RESCAN_EVERY):
+                self._prune_disk()
+        return entry
+
+    def _write_atomic(self, path, write):
+        # Batch workers share the directory, so files appear complete or not at all
+        temp = f"{path}.{os.getpid()}.tmp"
+        write(temp)
+        size = os.path.getsize(temp)
+        os.replace(temp, path)
+        return size
+
+    def _remember(self, key, entry):
+        self.entries.pop(key, None)
+        self.total_bytes -= self.sizes.pop(key, 0)
+        self.entries[key] = entry
+        self.sizes[key] = entry.nbytes
+        self.total_bytes += self.sizes[key]
+        while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            evicted, _ = self.entries.popitem(last=False)
+            self.total_bytes -= self.sizes.pop(evicted)
+            self.evictions += 1
+
+    def _prune_disk(self):
+        # Scans the directory, then deletes the oldest files until it fits. Other processes may be writing
+        # or pruning at the same time, so their temp files are left alone and vanished files are skipped.
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            except FileNotFoundError:
+                continue
+        used = sum(size for _, size, _ in files)
+        if used > self.max_disk_bytes:
+            for _, size, file_path in sorted(files):
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
+                used -= size
+                if used <= self.max_disk_bytes:
+                    break
+        self.disk_bytes = used
+        self.puts_since_scan = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.sizes.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "png_hits": self.png_hits,
+            "png_misses": self.png_misses,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "evictions": self.evictions,
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"Maze cache: {stats['hits']} hits, {stats['disk_hits']} disk hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['entries']} entries / {stats['bytes'] / 2**20:.1f} MB in memory")
+
+def _write_bytes(file_path, data):
+    with open(file_path, 'wb') as f:
+        f.write(data)
+
+def encode_png(image):
+    """
+    :param image: MazeImage
+    :return: The image as PNG bytes
+    """
+    buffer = io.BytesIO()
+    image.image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+def decode_png(data):
+    """
+    :param data: PNG bytes from encode_png
+    :return: MazeImage
+    """
+    return MazeImage.from_image(Image.open(io.BytesIO(data)).convert("RGB"))
@@ -0,0 +1,208 @@
+#This file holds the headless half of maze.py: the DFS generation itself, with no Tk or PIL imports.
+#MazeAlgorithm wraps it to draw each step, but batch jobs can use MazeGenerator on its own.
+#The method notes from maze.py came along with the methods.
+
+import random
+from array import array
+from math import floor
+from grid import MazeGrid
+
+class MazeGenerator:
+    def __init__(self, width, height, reach=25, bias=0, seed=None):
+        """
+        Sets up a maze generation run.
+
+        :param width: Number of cells across
+        :param height: Number of cells down
+        :param reach: Longest jump between cells, as a percentage of the width/height
+        :param bias: Chance (in percent) that a step prefers cells next to explored ones
+        :param seed: Seed for this run's random number generator (picked at random if None)
+        """
+        self.width, self.height = width, height
+        self.reach = reach
+        self.bias = bias
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.random = random.Random(self.seed)
+
+        self.grid = MazeGrid(width, height)
+
+        # A step can jump dx in range(-reach_x, reach_x) or dy in range(-reach_y, reach_y)
+        self.reach_x = floor(width*reach/100)
+        self.reach_y = floor(height*reach/100)
+
+        # Occupied unit segments: row_occupied[y*(width-1) + x] covers x..x+1 in row y,
+        # col_occupied[x*(height-1) + y] covers y..y+1 in column x (columns are stored contiguously)
+        self.row_occupied = bytearray(max(width-1, 0)*height)
+        self.col_occupied = bytearray(width*max(height-1, 0))
+
+        # explored_neighbors[cell] = how many of the cell's 4 neighbours are visited; visit() keeps it current
+        self.explored_neighbors = bytearray(width*height)
+
+    @property
+    def visited(self):
+        return self.grid.visited
+
+    @property
+    def edges(self):
+        return self.grid.edges()
+
+    @property
+    def start_node(self):
+        return self.grid.node(self.grid.start) if self.grid.start >= 0 else None
+
+    @property
+    def end_node(self):
+        return self.grid.node(self.grid.end) if self.grid.end >= 0 else None
+
+    def free_run(self, occupied, base, pos, back_limit, forward_limit):
+        """
+        Counts how far a corridor can go from pos along one row/column before it would
+        pass over a carved segment. Uses bytearray.find/rfind so long reaches stay cheap.
+
+        :return: (steps back, steps forward)
+        """
+        back_limit, forward_limit = max(back_limit, 0), max(forward_limit, 0)
+        hit = occupied.rfind(1, base + pos - back_limit, base + pos)
+        back = back_limit if hit == -1 else base + pos - hit - 1
+        hit = occupied.find(1, base + pos, base + pos + forward_limit)
+        forward = forward_limit if hit == -1 else hit - base - pos
+        return back, forward
+
+    def get_unvisited_neighbors(self, cell):
+        """
+        Finds every cell a corridor from `cell` could reach: in bounds, within reach, unvisited
+        and not crossing a carved segment. Only those survivors get shuffled.
+        Survivors are listed row first then column, left-to-right/top-to-bottom.
+        The row and the column are plain bytearray slices of the visited flags.
+        """
+        x, y = self.grid.coords(cell)
+        width = self.width
+        left, right = self.free_run(self.row_occupied, y*(width-1), x,
+                                    min(self.reach_x, x), min(self.reach_x-1, width-1-x))
+        up, down = self.free_run(self.col_occupied, x*(self.height-1), y,
+                                 min(self.reach_y, y), min(self.reach_y-1, self.height-1-y))
+
+        visited = self.grid.visited
+        row = visited[y*width + x-left:y*width + x+right+1]
+        column = visited[(y-up)*width + x:(y+down)*width + x+1:width]
+        neighbors = [y*width + x-left + i for i, v in enumerate(row) if not v]
+        neighbors += [(y-up + i)*width + x for i, v in enumerate(column) if not v]
+        self.random.shuffle(neighbors)
+        return neighbors
+
+    def visit(self, cell):
+        """
+        Marks a cell visited and bumps the explored count of each of its neighbours.
+        """
+        self.grid.visited[cell] = 1
+        counts, width = self.explored_neighbors, self.width
+        x = cell % width
+        if x > 0:
+            counts[cell - 1] += 1
+        if x < width - 1:
+            counts[cell + 1] += 1
+        if cell >= width:
+            counts[cell - width] += 1
+        if cell + width < len(counts):
+            counts[cell + width] += 1
+
+    def parallel_bias(self, neighbors): #ChatGPT wrote this method, now it reads the counts kept by visit()
+        # Orders the neighbors by their number of explored neighbors (descending), keeping the
+        # incoming order among equal counts just like the old stable sorted(..., reverse=True)
+        counts = self.explored_neighbors
+        buckets = ([], [], [], [], [])
+        for cell in neighbors:
+            buckets[counts[cell]].append(cell)
+        return buckets[4] + buckets[3] + buckets[2] + buckets[1] + buckets[0]
+
+    def is_connected(self, node_1, node_2): #ChatGPT wrote this method, now it asks the grid
+        # Check if there's already an edge between node_1 and node_2
+        return self.grid.has_edge(self.grid.cell(node_1.x, node_1.y), self.grid.cell(node_2.x, node_2.y))
+
+    def add_edge(self, cell1, cell2): #ChatGPT wrote this method, now it reads the occupancy arrays
+        # True unless a corridor between the two cells would run along an already carved one
+        x1, y1 = self.grid.coords(cell1)
+        x2, y2 = self.grid.coords(cell2)
+        if y1 == y2:
+            base = y1*(self.width-1)
+            return self.row_occupied.find(1, base + min(x1, x2), base + max(x1, x2)) == -1
+        base = x1*(self.height-1)
+        return self.col_occupied.find(1, base + min(y1, y2), base + max(y1, y2)) == -1
+
+    def mark_segment(self, cell1, cell2):
+        x1, y1 = self.grid.coords(cell1)
+        x2, y2 = self.grid.coords(cell2)
+        if y1 == y2:
+            base = y1*(self.width-1)
+            self.row_occupied[base + min(x1, x2):base + max(x1, x2)] = b'\x01' * abs(x2 - x1)
+        else:
+            base = x1*(self.height-1)
+            self.col_occupied[base + min(y1, y2):base + max(y1, y2)] = b'\x01' * abs(y2 - y1)
+
+    def choose_endpoints(self):
+        # Randomly select start and end cells on opposite edges
+        start_side = self.random.choice(['top', 'bottom', 'left', 'right'])
+        end_side = {'top': 'bottom', 'bottom': 'top', 'left': 'right', 'right': 'left'}[start_side]
+
+        def pick(side):
+            if side == 'top':
+                return self.grid.cell(self.random.randint(0, self.width-1), 0)
+            elif side == 'bottom':
+                return self.grid.cell(self.random.randint(0, self.width-1), self.height-1)
+            elif side == 'left':
+                return self.grid.cell(0, self.random.randint(0, self.height-1))
+            else:  # right
+                return self.grid.cell(self.width-1, self.random.randint(0, self.height-1))
+
+        self.grid.start = pick(start_side)
+        self.grid.end = pick(end_side)
+        return self.start_node, self.end_node
+
+    def carve(self, on_carve=None, on_backtrack=None):
+        """
+        Runs the DFS from the start cell, carving an edge for every step.
+        The DFS keeps its own stack instead of recursing, so long corridors can't hit the recursion limit.
+        Each frame is a cell index plus an iterator over its candidate cells, in the same order
+        (and with the same random draws) as the old recursive version.
+
+        :param on_carve: Optional callback called with (prev_cell, current_cell) after each carve
+        :param on_backtrack: Optional callback called with (dead_end_cell, cell_returned_to) when the DFS backs up
+        """
+        grid = self.grid
+        visited = grid.visited
+
+        def candidates(cell):
+            neighbors = self.get_unvisited_neighbors(cell)
+            if self.bias/100>self.random.random():
+                neighbors = self.parallel_bias(neighbors)
+            return iter(array('i', neighbors))
+
+        self.visit(grid.start)
+        stack = [(grid.start, candidates(grid.start))]
+        while stack:
+            cell, neighbors = stack[-1]
+            for next_cell in neighbors:
+                if not visited[next_cell] and self.add_edge(next_cell, cell):
+                    self.visit(next_cell)
+                    grid.add_edge(cell, next_cell)
+                    self.mark_segment(cell, next_cell)
+                    if on_carve is not None:
+                        on_carve(cell, next_cell)
+                    stack.append((next_cell, candidates(next_cell)))
+                    break
+            else:
+                # Every candidate was used up, so backtrack
+                stack.pop()
+                if on_backtrack is not None and stack:
+                    on_backtrack(cell, stack[-1][0])
+
+    def generate(self, on_carve=None, on_backtrack=None):
+        """
+        Generates a full maze without drawing anything.
+
+        :param on_carve, on_backtrack: Optional callbacks, see carve
+        :return: (grid, start_node, end_node); grid.edges() gives Edge objects if needed
+        """
+        self.choose_endpoints()
+        self.carve(on_carve, on_backtrack)
+        return self.grid, self.start_node, self.end_node
@@ -0,0 +1,221 @@
+#This file holds the one CSV parser that the solvers and the importer share.
+#It reads the export line by line and keeps everything in int arrays, so big mazes stay small in memory.
+#Debug output goes through logging instead of print; turn on DEBUG for the "graph.py" logger to see it.
+
+import logging
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # build_csr falls back to plain loops
+    np = None
+
+logger = logging.getLogger(__name__)
+
+NODES_HEADER = "# Nodes"
+EDGES_HEADER = "# Edges (Adjacency List)"
+SEED_HEADER = "# Seed"
+
+class MazeGraph:
+    def __init__(self):
+        """
+        An empty maze graph; read_maze_csv fills one in.
+        Nodes are (x, y) tuples on the outside and y*width + x cells on the inside.
+        """
+        self.seed = None
+        self.start_node = None
+        self.end_node = None
+        self.width = 0
+        self.height = 0
+
+        # Rows of the "# Nodes" section: corridor i runs (x1, y1) -> (x2, y2) in colors[i]
+        self.corridor_x1, self.corridor_y1 = array('i'), array('i')
+        self.corridor_x2, self.corridor_y2 = array('i'), array('i')
+        self.colors = []
+
+        # Rows of the adjacency section, as cells once finish() knows the width
+        self.edge_source = array('i')
+        self.edge_target = array('i')
+
+        # CSR neighbor lists: neighbors of cell c are targets[offsets[c]:offsets[c + 1]]
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+
+    def cell(self, node):
+        return node[1] * self.width + node[0]
+
+    def node(self, cell):
+        y, x = divmod(cell, self.width)
+        return x, y
+
+    def corridors(self):
+        """Yields ((x1, y1), (x2, y2), color) for every row of the node section."""
+        for i in range(len(self.colors)):
+            yield ((self.corridor_x1[i], self.corridor_y1[i]),
+                   (self.corridor_x2[i], self.corridor_y2[i]),
+                   self.colors[i])
+
+    def neighbor_cells(self, cell):
+        return self.targets[self.offsets[cell]:self.offsets[cell + 1]]
+
+    def neighbors(self, node):
+        if not self._in_bounds(node):
+            return []
+        return [self.node(cell) for cell in self.neighbor_cells(self.cell(node))]
+
+    def _in_bounds(self, node):
+        return 0 <= node[0] < self.width and 0 <= node[1] < self.height
+
+    def __getitem__(self, node):
+        return self.neighbors(node)
+
+    def __contains__(self, node):
+        # Same meaning as the old defaultdict: the node has at least one connection
+        if not self._in_bounds(node):
+            return False
+        cell = self.cell(node)
+        return self.offsets[cell + 1] > self.offsets[cell]
+
+    def __len__(self):
+        return sum(1 for cell in range(self.width * self.height) if self.offsets[cell + 1] > self.offsets[cell])
+
+    def finish(self, source_x, source_y, target_x, target_y):
+        """
+        Turns the adjacency rows into CSR arrays. Each node's neighbors keep file order,
+        the same order the old defaultdict(list) appended them in.
+        """
+        xs = [max(column, default=-1) for column in (self.corridor_x1, self.corridor_x2, source_x, target_x)]
+        ys = [max(column, default=-1) for column in (self.corridor_y1, self.corridor_y2, source_y, target_y)]
+        self.width, self.height = max(xs) + 1, max(ys) + 1
+
+        self.edge_source = array('i', [y * self.width + x for x, y in zip(source_x, source_y)])
+        self.edge_target = array('i', [y * self.width + x for x, y in zip(target_x, target_y)])
+        self.build_csr()
+
+    def corridors_from_edges(self):
+        """Fills the corridor list (all white) from edge_source/edge_target, for formats without one."""
+        if np is not None:
+            source = np.frombuffer(self.edge_source, dtype=np.int32)
+            target = np.frombuffer(self.edge_target, dtype=np.int32)
+            self.corridor_x1 = array('i', (source % self.width).tobytes())
+            self.corridor_y1 = array('i', (source // self.width).tobytes())
+            self.corridor_x2 = array('i', (target % self.width).tobytes())
+            self.corridor_y2 = array('i', (target // self.width).tobytes())
+        else:
+            self.corridor_x1 = array('i', [cell % self.width for cell in self.edge_source])
+            self.corridor_y1 = array('i', [cell // self.width for cell in self.edge_source])
+            self.corridor_x2 = array('i', [cell % self.width for cell in self.edge_target])
+            self.corridor_y2 = array('i', [cell // self.width for cell in self.edge_target])
+        self.colors = ["white"] * len(self.edge_source)
+
+    def build_csr(self):
+        """Builds offsets/targets from edge_source/edge_target; width and height must be set."""
+        size = self.width * self.height
+        if np is not None:
+            # Both directions of every edge, interleaved in the order the loop below visits them;
+            # a stable sort by source keeps each cell's neighbors in that order
+            sources = np.empty(2 * len(self.edge_source), dtype=np.int32)
+            sources[0::2] = np.frombuffer(self.edge_source, dtype=np.int32)
+            sources[1::2] = np.frombuffer(self.edge_target, dtype=np.int32)
+            destinations = np.empty_like(sources)
+            destinations[0::2] = sources[1::2]
+            destinations[1::2] = sources[0::2]
+            offsets = np.zeros(size + 1, dtype=np.int32)
+            np.cumsum(np.bincount(sources, minlength=size), out=offsets[1:])
+            self.offsets = array('i', offsets.tobytes())
+            self.targets = array('i', destinations[np.argsort(sources, kind='stable')].tobytes())
+            return
+
+        degree = array('i', bytes(4 * (size + 1)))
+        for source, target in zip(self.edge_source, self.edge_target):
+            degree[source + 1] += 1
+            degree[target + 1] += 1
+        for cell in range(size):
+            degree[cell + 1] += degree[cell]
+        self.offsets = degree
+
+        self.targets = array('i', bytes(4 * degree[size]))
+        fill = array('i', degree[:size])
+        for source, target in zip(self.edge_source, self.edge_target):
+            self.targets[fill[source]] = target
+            fill[source] += 1
+            self.targets[fill[target]] = source
+            fill[target] += 1
+
+def read_maze_csv(csv_file):
+    """
+    Reads a maze CSV export in a single pass.
+
+    :param csv_file: Path to the CSV file
+    :return: MazeGraph
+    """
+    graph = MazeGraph()
+    source_x, source_y = array('i'), array('i')
+    target_x, target_y = array('i'), array('i')
+    section = None
+    skip_header = False
+
+    with open(csv_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line == NODES_HEADER or line == EDGES_HEADER:
+                section = line
+                skip_header = True
+                continue
+            if line.startswith(SEED_HEADER):
+                graph.seed = int(line.split(',')[1])
+                continue
+            if skip_header:
+                skip_header = False
+                continue
+
+            row = line.split(',')
+            if section == NODES_HEADER:
+                try:
+                    x1, y1, x2, y2 = int(row[0]), int(row[1]), int(row[4]), int(row[5])
+                    if row[2].lower() == 'true':
+                        graph.start_node = (x1, y1)
+                        logger.debug("Found start node: %s", graph.start_node)
+                    if row[6].lower() == 'true':
+                        graph.start_node = (x2, y2)
+                        logger.debug("Found start node: %s", graph.start_node)
+                    if row[3].lower() == 'true':
+                        graph.end_node = (x1, y1)
+                        logger.debug("Found end node: %s", graph.end_node)
+                    if row[7].lower() == 'true':
+                        graph.end_node = (x2, y2)
+                        logger.debug("Found end node: %s", graph.end_node)
+                except (ValueError, IndexError) as e:
+                    logger.warning("Error parsing node row %s: %s", row, e)
+                    continue
+                graph.corridor_x1.append(x1)
+                graph.corridor_y1.append(y1)
+                graph.corridor_x2.append(x2)
+                graph.corridor_y2.append(y2)
+                graph.colors.append(row[8] if len(row) > 8 else "white")
+            elif section == EDGES_HEADER:
+                # Each row is source_x, source_y, neighbor_x, neighbor_y
+                if len(row) != 4:
+                    logger.warning("Skipping invalid edge row: %s", row)
+                    continue
+                try:
+                    x1, y1, x2, y2 = map(int, row)
+                except ValueError as e:
+                    logger.warning("Error parsing edge row %s: %s", row, e)
+                    continue
+                source_x.append(x1)
+                source_y.append(y1)
+                target_x.append(x2)
+                target_y.append(y2)
+
+    graph.finish(source_x, source_y, target_x, target_y)
+
+    logger.debug("Total corridors: %d", len(graph.colors))
+    logger.debug("Total graph edges: %d", len(graph.edge_source))
+    if logger.isEnabledFor(logging.DEBUG):
+        for cell in range(graph.width * graph.height):
+            if graph.offsets[cell + 1] > graph.offsets[cell]:
+                logger.debug("%s: %s", graph.node(cell), [graph.node(n) for n in graph.neighbor_cells(cell)])
+    return graph
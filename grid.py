@@ -0,0 +1,68 @@
+#This file holds the compact grid that MazeGenerator and the exporters work on.
+#Cells are plain ints (y*width + x) so big mazes don't need a Node object per cell.
+#Node and Edge objects are only made when something asks for them.
+
+from array import array
+from node import Node, Edge
+
+class MazeGrid:
+    def __init__(self, width, height):
+        """
+        Creates an empty grid with nothing visited or carved yet.
+
+        :param width: Number of cells across
+        :param height: Number of cells down
+        """
+        self.width, self.height = width, height
+        self.size = width * height
+        self.visited = bytearray(self.size)
+
+        # Parallel columns: edge i runs from edge_from[i] to edge_to[i]
+        self.edge_from = array('i')
+        self.edge_to = array('i')
+        # min*size + max for each indexed edge, built on the first has_edge call
+        self._edge_keys = None
+        self._indexed = 0
+
+        self.start = -1
+        self.end = -1
+
+    def cell(self, x, y):
+        return y * self.width + x
+
+    def coords(self, cell):
+        y, x = divmod(cell, self.width)
+        return x, y
+
+    def node(self, cell):
+        x, y = self.coords(cell)
+        return Node(x, y, is_start=cell == self.start, is_end=cell == self.end)
+
+    def add_edge(self, cell1, cell2):
+        self.edge_from.append(cell1)
+        self.edge_to.append(cell2)
+
+    def edge_count(self):
+        return len(self.edge_from)
+
+    def iter_edges(self):
+        return zip(self.edge_from, self.edge_to)
+
+    def edge_key(self, cell1, cell2):
+        return min(cell1, cell2) * self.size + max(cell1, cell2)
+
+    def has_edge(self, cell1, cell2):
+        # Catches the index up with whatever was appended since the last call, however the columns were
+        # filled (add_edge, StepLog.to_grid, or read_maze_grid loading them straight from a file)
+        if self._edge_keys is None:
+            self._edge_keys = set()
+        if self._indexed < len(self.edge_from):
+            edge_key = self.edge_key
+            self._edge_keys.update(edge_key(a, b) for a, b in
+                                   zip(self.edge_from[self._indexed:], self.edge_to[self._indexed:]))
+            self._indexed = len(self.edge_from)
+        return self.edge_key(cell1, cell2) in self._edge_keys
+
+    def edges(self):
+        # Builds Edge objects on demand; start/end nodes are flagged like the old Node grid did
+        return [Edge(self.node(a), self.node(b)) for a, b in self.iter_edges()]
@@ -4,15 +4,33 @@
 
 import os
 import csv
+import mmap
+import struct
+import sys
+from array import array
 from PIL import Image, ImageDraw
 from datetime import datetime
-from node import Node, Edge
-from tkinter import filedialog, messagebox
-from solver import BreadthFirstSolver,DepthFirstSolver
+from node import Node
+from solver import SOLVERS
+from graph import MazeGraph, read_maze_csv
+from grid import MazeGrid
 
 solution_image = None
 
+# Binary maze format (.maze), all little-endian:
+#   header  magic, version, flags, width, height, start cell, end cell, seed, edge count
+#   edges   edge count uint32 "from" cells, then edge count uint32 "to" cells, in carve order
+#   csr     (only with FLAG_HAS_CSR) MazeGraph's offsets and targets arrays, for solving straight off an mmap
+# A cell is y * width + x, and -1 means no start/end cell.
+BINARY_MAGIC = b"SMAZ"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHHIIiiqI")
+FLAG_HAS_SEED = 1
+FLAG_HAS_CSR = 2  # Followed by (width * height + 1) int32 offsets and 2 * edge count int32 neighbor targets
+SEED_RANGE = range(-2**63, 2**63)  # The header stores the seed as an int64 (so does the .steps header)
+
 def export_maze_to_png(canvas_widget, image):
+    from tkinter import messagebox  # Only the UI exports this way; the headless tools import load without Tk
     global solution_image
     # Create export directory if it doesn't exist
     export_dir = 'maze_exports'
@@ -34,62 +52,229 @@ def export_maze_to_png(canvas_widget, image):
 
     return png_filename
 
-def export_maze_to_csv(maze, output_filename='maze.csv'):
-    edges = set()
+def export_maze_to_csv(maze, output_filename='maze.csv', export_dir='./maze_exports'):
+    # Reads the maze's compact grid directly, so no Edge objects get built
+    grid = maze.grid
 
     # Ensure the export directory exists
-    export_dir = './maze_exports'
     os.makedirs(export_dir, exist_ok=True)
 
     # Full path for the output file
     full_path = os.path.join(export_dir, output_filename)
-    for edge in maze.edges:
-        node1, node2 = edge.node1, edge.node2
-        if maze.is_connected(node1, node2):  # Assuming `edge.is_connected` determines if the nodes are connected
-            edges.add(((node1.x, node1.y), (node2.x, node2.y)))
-            edges.add(((node2.x, node2.y), (node1.x, node1.y)))  # Bidirectional edge
 
     # Write the CSV file
     with open(full_path, 'w', newline='') as csvfile:
         csv_writer = csv.writer(csvfile)
 
-        # Write header
+        # Write header; the seed line lets the same maze be generated again
+        csv_writer.writerow(['# Seed', maze.seed])
         csv_writer.writerow(['# Nodes'])
         csv_writer.writerow([
             'Node0_X', 'Node0_Y', 'Node0_IsStart', 'Node0_IsEnd',
             'Node1_X', 'Node1_Y', 'Node1_IsStart', 'Node1_IsEnd',
             'Edge_Color'
         ])
-        for edge in maze.edges:
-            node1, node2 = edge.node1, edge.node2
+        for cell1, cell2 in grid.iter_edges():
+            x1, y1 = grid.coords(cell1)
+            x2, y2 = grid.coords(cell2)
             csv_writer.writerow([
-                node1.x, node1.y,
-                str(node1.is_start), str(node1.is_end),
-                node2.x, node2.y,
-                str(node2.is_start), str(node2.is_end),
-                edge.color
+                x1, y1,
+                str(cell1 == grid.start), str(cell1 == grid.end),
+                x2, y2,
+                str(cell2 == grid.start), str(cell2 == grid.end),
+                "white"
             ])
 
         csvfile.write("\n# Edges (Adjacency List)\n")
         csvfile.write("source_x,source_y,neighbor_x,neighbor_y\n")
 
-        # Write edges from the set
-        written_edges = set()  # Track written edges to avoid duplicates
-        for (source, target) in edges:
-            if (source, target) not in written_edges:  # Avoid duplicates
-                csvfile.write(f"{source[0]},{source[1]},{target[0]},{target[1]}\n")
-                written_edges.add((source, target))
-                written_edges.add((target, source))
+        # Every carved edge is written once; the solvers add the reverse direction themselves
+        for cell1, cell2 in grid.iter_edges():
+            x1, y1 = grid.coords(cell1)
+            x2, y2 = grid.coords(cell2)
+            csvfile.write(f"{x1},{y1},{x2},{y2}\n")
+
+    return full_path
 
+def _little_endian(cells):
+    # array('i') is in native byte order; the file is always little-endian
+    if sys.byteorder == "big":
+        cells = array('i', cells)
+        cells.byteswap()
+    return cells
+
+def export_maze_to_binary(maze, output_filename='maze.maze', export_dir='./maze_exports', csr=False):
+    """
+    Writes the maze in the binary format described at the top of this file.
+    It is a fraction of the CSV's size and needs no text parsing to read back.
+
+    :param maze: MazeAlgorithm or MazeGenerator (anything with .grid and .seed)
+    :param csr: Also store the neighbor lists, so MappedMazeGraph can solve straight from the file
+    :return: Path of the written file
+    """
+    grid = maze.grid
+    os.makedirs(export_dir, exist_ok=True)
+    full_path = os.path.join(export_dir, output_filename)
 
+    flags = FLAG_HAS_SEED if maze.seed is not None else 0
+    if csr:
+        flags |= FLAG_HAS_CSR
+        graph = MazeGraph()
+        graph.width, graph.height = grid.width, grid.height
+        graph.edge_source, graph.edge_target = grid.edge_from, grid.edge_to
+        graph.build_csr()
+
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, grid.width, grid.height,
+                                grid.start, grid.end, maze.seed or 0, grid.edge_count())
+    with open(full_path, 'wb') as f:
+        f.write(header)
+        _little_endian(grid.edge_from).tofile(f)
+        _little_endian(grid.edge_to).tofile(f)
+        if csr:
+            _little_endian(graph.offsets).tofile(f)
+            _little_endian(graph.targets).tofile(f)
     return full_path
 
+def is_binary_maze(file_path):
+    with open(file_path, 'rb') as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+def _binary_layout(data, file_path):
+    """
+    Checks a binary maze file's header and works out where its sections are.
+
+    :param data: The file's bytes (or an mmap of them)
+    :return: (header fields, {section name: (byte offset, int count)})
+    """
+    if len(data) < BINARY_HEADER.size:
+        raise ValueError(f"{file_path} is too short to be a maze file")
+    fields = BINARY_HEADER.unpack_from(data)
+    magic, version, flags, width, height, start, end, seed, edge_count = fields
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"{file_path} is not a maze file")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported maze file version {version}")
+
+    counts = [("edge_source", edge_count), ("edge_target", edge_count)]
+    if flags & FLAG_HAS_CSR:
+        counts += [("offsets", width * height + 1), ("targets", 2 * edge_count)]
+    sections = {}
+    position = BINARY_HEADER.size
+    for name, count in counts:
+        sections[name] = (position, count)
+        position += 4 * count
+    if len(data) < position:
+        raise ValueError(f"{file_path} is truncated")
+    return fields, sections
+
+def _graph_header(graph, fields):
+    _, _, flags, width, height, start, end, seed, _ = fields
+    graph.width, graph.height = width, height
+    graph.seed = seed if flags & FLAG_HAS_SEED else None
+    graph.start_node = graph.node(start) if start >= 0 else None
+    graph.end_node = graph.node(end) if end >= 0 else None
+
+def read_maze_binary(file_path):
+    """
+    Reads a binary maze file into the same MazeGraph that read_maze_csv builds.
+
+    :param file_path: Path to the .maze file
+    :return: MazeGraph
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    fields, sections = _binary_layout(data, file_path)
+
+    graph = MazeGraph()
+    _graph_header(graph, fields)
+    for name, (position, count) in sections.items():
+        cells = array('i')
+        cells.frombytes(data[position:position + 4 * count])
+        setattr(graph, name, _little_endian(cells))
+    if "offsets" not in sections:
+        graph.build_csr()
+    graph.corridors_from_edges()
+    return graph
+
+def read_maze_grid(file_path):
+    """
+    Reads a binary maze file back into a MazeGrid, for reusing a maze rather than solving it.
+
+    :param file_path: Path to the .maze file
+    :return: (MazeGrid, seed or None)
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    fields, sections = _binary_layout(data, file_path)
+    _, _, flags, width, height, start, end, seed, _ = fields
+
+    grid = MazeGrid(width, height)
+    grid.start, grid.end = start, end
+    for name, cells in (("edge_source", grid.edge_from), ("edge_target", grid.edge_to)):
+        position, count = sections[name]
+        cells.frombytes(data[position:position + 4 * count])
+        if sys.byteorder == "big":
+            cells.byteswap()
+    for cell in grid.edge_from + grid.edge_to:
+        grid.visited[cell] = 1
+    return grid, seed if flags & FLAG_HAS_SEED else None
+
+class MappedMazeGraph(MazeGraph):
+    def __init__(self, file_path):
+        """
+        A MazeGraph whose edge and neighbor arrays are views straight into a memory-mapped .maze file.
+        Nothing is copied, so the OS only reads the pages a solver actually touches. Files written
+        without csr=True get their neighbor lists built in memory instead.
+        The solvers work on it unchanged. The corridor list stays empty, so it is for solving, not drawing.
+        Call close() (or use it in a with block) when done.
+
+        :param file_path: Path to the .maze file
+        """
+        super().__init__()
+        self.file = open(file_path, 'rb')
+        self.mapping = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        fields, sections = _binary_layout(self.mapping, file_path)
+        _graph_header(self, fields)
+
+        self.views = []
+        buffer = memoryview(self.mapping)
+        self.views.append(buffer)
+        for name, (position, count) in sections.items():
+            if sys.byteorder == "big":
+                # Native ints are the wrong way round here, so this section has to be copied and swapped
+                cells = array('i')
+                cells.frombytes(buffer[position:position + 4 * count])
+                cells.byteswap()
+            else:
+                cells = buffer[position:position + 4 * count].cast('i')
+                self.views.append(cells)
+            setattr(self, name, cells)
+        if "offsets" not in sections:
+            self.build_csr()
+
+    def close(self):
+        # Every view has to be released before the mapping can close
+        self.edge_source = self.edge_target = self.offsets = self.targets = None
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        self.mapping.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 def import_maze_from_csv(ui, solve_type, solve=False):
+    from tkinter import filedialog
     ui.generate_maze(True)
     # Open file dialog
     file_path = filedialog.askopenfilename(
-        title="Select CSV File to Import Edges",
-        filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+        title="Select CSV or Maze File to Import Edges",
+        filetypes=[("Maze exports", "*.csv *.maze"), ("CSV files", "*.csv"), ("Maze files", "*.maze"),
+                   ("All files", "*.*")],
         initialdir='./maze_exports'
     )
 
@@ -98,80 +283,39 @@ def import_maze_from_csv(ui, solve_type, solve=False):
         print("No file selected.")
         return []
 
-    # List to store imported edges
-    imported_edges = []
-
-    # Read the CSV file
+    # Read the file with the same parsers the solvers use
     try:
-        csvfile = open(file_path, 'r')
-        csv_reader = csv.reader(csvfile)
-
-        # Skip the header row
-        next(csv_reader)
-        next(csv_reader)
-
-        # Process each row
-        for row in csv_reader:
-            if len(row) <= 4: #Skip Lahiji rows
-                continue
-            # Convert string representations to appropriate types
-            node0 = Node(
-                x=float(row[0]),
-                y=float(row[1]),
-                is_start=row[2].lower() == 'true',
-                is_end=row[3].lower() == 'true'
-            )
-
-            node1 = Node(
-                x=float(row[4]),
-                y=float(row[5]),
-                is_start=row[6].lower() == 'true',
-                is_end=row[7].lower() == 'true'
-            )
-
-            if node0.is_start:
-                ui.current_maze_algorithm.start_node = node0
-            if node1.is_start:
-                ui.current_maze_algorithm.start_node = node1
-            if node0.is_end:
-                ui.current_maze_algorithm.end_node = node0
-            if node1.is_end:
-                ui.current_maze_algorithm.end_node = node1
-
-            # Create edge with the two nodes and color
-            edge = Edge(node0, node1, row[8])
-
-            # Add to list of imported edges
-            imported_edges.append(edge)
-
+        graph = read_maze_binary(file_path) if is_binary_maze(file_path) else read_maze_csv(file_path)
     except Exception as e:
         print(f"Error importing edges: {e}")
         return []
 
-    print(f"Imported maze of {len(imported_edges)} paths from {file_path}")
+    maze = ui.current_maze_algorithm
+    if graph.seed is not None:
+        maze.generator.seed = graph.seed
+    if graph.start_node is not None:
+        maze.start_node = Node(*graph.start_node, is_start=True)
+    if graph.end_node is not None:
+        maze.end_node = Node(*graph.end_node, is_end=True)
 
+    print(f"Imported maze of {len(graph.colors)} paths from {file_path}")
+
+    # One pass draws the canvas and the maze image; the solution image shares that raster until the solver draws
+    base = maze.draw_graph(graph)
     global solution_image
     if solve:
-        solution_image = MazeImage(ui.canvas.winfo_width(), ui.canvas.winfo_height())
-    for edge in imported_edges:
-        ui.current_maze_algorithm.quick_rectangle(ui.current_maze_algorithm.canvas, edge.node1, edge.node2,
-                                                  ui.current_maze_algorithm.cell_width // 2, color=edge.color)
-        ui.current_maze_algorithm.quick_rectangle(ui.current_maze_algorithm.canvas, edge.node1, edge.node2,
-                                                  ui.current_maze_algorithm.cell_width // 2,
-                                                  draw_rectangle_func=ui.current_maze_algorithm.image.draw_rectangle,
-                                                  color=edge.color)
-        ui.current_maze_algorithm.quick_rectangle(ui.current_maze_algorithm.canvas, edge.node1, edge.node2,
-                                                  ui.current_maze_algorithm.cell_width // 2,
-                                                  draw_rectangle_func=solution_image.draw_rectangle,
-                                                  color=edge.color)
+        solution_image = base.shared_copy()
 
     if solve:
-        if solve_type == "bfs":
-            solver = BreadthFirstSolver(ui, file_path, solution_image)
-            solver.solve_with_visualization()
-        elif solve_type == "dfs":
-            solver = DepthFirstSolver(ui, file_path, solution_image)
-            solver.solve_with_visualization()
+        solver = SOLVERS[solve_type](ui, file_path, solution_image, graph)
+
+        def show_report(path):
+            # Show how much work the solver did, so solvers can be compared on the same maze
+            if solver.nodes_expanded:
+                ui._show_banner(solver.report(), bg_color='green')
+
+        # The search runs on a worker thread; the report banner goes up once it is done
+        solver.solve_with_visualization(on_done=show_report)
 
     ui.maze_generation_complete()
 
@@ -188,6 +332,37 @@ class MazeImage:
         self.height = height
         self.image = Image.new("RGB", (width, height), "black")
         self.draw = ImageDraw.Draw(self.image)
+        self.shared = False
+
+    @classmethod
+    def from_image(cls, image):
+        """
+        Wraps an existing RGB PIL image, e.g. one built by render.RasterImage.
+
+        :param image: PIL image to draw on
+        """
+        maze_image = cls.__new__(cls)
+        maze_image.width, maze_image.height = image.size
+        maze_image.image = image
+        maze_image.draw = ImageDraw.Draw(image)
+        maze_image.shared = False
+        return maze_image
+
+    def shared_copy(self):
+        """
+        Returns a MazeImage showing the same pixels without copying them yet.
+        Whichever of the two is drawn on first takes its own copy (copy-on-write).
+        """
+        copy = MazeImage.from_image(self.image)
+        copy.shared = self.shared = True
+        return copy
+
+    def _unshare(self):
+        # Called before drawing: a shared image is copied so the other MazeImages keep the old pixels
+        if self.shared:
+            self.image = self.image.copy()
+            self.draw = ImageDraw.Draw(self.image)
+            self.shared = False
 
     def draw_rectangle(self, x1, y1, x2, y2, fill="white", outline=""):
         """
@@ -198,6 +373,7 @@ class MazeImage:
         :param fill: Fill color of the rectangle
         :param outline: Outline color of the rectangle
         """
+        self._unshare()
         self.draw.rectangle([(min(x1, x2), min(y1, y2)), (max(x1, x2), max(y1, y2))], fill=fill)
 
     def draw_ellipse(self, x1, y1, x2, y2, fill="white", outline="", width=1):
@@ -210,6 +386,7 @@ class MazeImage:
         :param outline: Outline color of the ellipse
         :param width: Thickness of the ellipse outline
         """
+        self._unshare()
         if width > 1:
             for offset in range(width):
                 self.draw.ellipse([
@@ -227,6 +404,7 @@ class MazeImage:
         :param fill: Color of the line
         :param width: Thickness of the line
         """
+        self._unshare()
         if width > 1:
             for offset in range(-width//2, width//2 + 1):
                 self.draw.line([(x1 + offset, y1), (x2 + offset, y2)], fill=fill)
@@ -4,6 +4,7 @@
 #Therefore, instead of commenting on all the methods that were generated by Claude, we commented on the methods that weren't.
 
 import tkinter as tk
+from profiling import enable_from_environment
 from ui import MazeGeneratorUI
 
 def center_window(root, width, height):
@@ -17,6 +18,9 @@ def center_window(root, width, height):
     root.geometry('%dx%d+%d+%d' % (width, height, x, y))
 
 def main():
+    # Opt-in timing of every generation and solve (see profiling.py)
+    enable_from_environment()
+
     root = tk.Tk()
     root.title("Spaghetti Supper")
 
@@ -1,23 +1,26 @@
 #Claude originally generated this file. Max and Owen needed to make minor edits on most of the methods.
 #Some of the methods were added later on using ChatGPT.
 #The animate_rectangle and quick_rectangle functions were almost entirely written by Max, though.
+#quick_rectangle's drawing code now lives in render.py as draw_corridor.
 #Additional notes are located next to the method headers.
+#The generation methods themselves moved to generator.py so they can run without Tk.
 
-import random
-from node import Edge
+import time
+from generator import MazeGenerator
 from load import MazeImage
-from math import floor
+from node import Node
+from render import draw_corridor, draw_maze, draw_marker, render_graph_image, render_maze_image
+from steplog import BACKTRACK, CARVE, StepLog
+from worker import BackgroundJob
 
+#MazeAlgorithm is now a thin wrapper that draws what MazeGenerator carves.
 class MazeAlgorithm:
-    def __init__(self, ui, width, height, canvas_width=None, canvas_height=None):
+    def __init__(self, ui, width, height, canvas_width=None, canvas_height=None, seed=None):
         self.canvas = ui.canvas
         self.width, self.height = width, height
         self.master = ui.master
         self.ui = ui
 
-        self.end_node = None
-        self.start_node = None
-
         self.reach_var = ui.reach_var
         self.speed_var = ui.speed_var
 
@@ -33,110 +36,204 @@ class MazeAlgorithm:
         self.offset_x = (canvas_width - (self.cell_width * width)) // 2
         self.offset_y = (canvas_height - (self.cell_height * height)) // 2
 
-        self.edges = []
-        self.visited = set()
-
-        # Directions initialization
-        self.directions = [
-                              (dx, 0) for dx in range(-floor(width*ui.reach_var.get()/100), floor(width*ui.reach_var.get()/100))
-                          ] + [
-                              (0, dy) for dy in range(-floor(height*ui.reach_var.get()/100), floor(height*ui.reach_var.get()/100))
-                          ]
+        # The reach and bias sliders are read once, when the maze is set up
+        self.generator = MazeGenerator(width, height, ui.reach_var.get(), ui.bias.get(), seed)
+        self.start_node = None
+        self.end_node = None
 
         self.image = MazeImage(canvas_width, canvas_height)
 
-    def get_unvisited_neighbors(self, node, grid):
-        random.shuffle(self.directions)
-        return [
-            grid[new_y][new_x] for dx, dy in self.directions
-            if (0 <= (new_x := node.x + dx) < self.width and
-                0 <= (new_y := node.y + dy) < self.height and
-                grid[new_y][new_x] not in self.visited and
-                self.add_edge(grid[new_y][new_x], node))
-        ]
-
-    def parallel_bias(self, neighbors, grid): #ChatGPT wrote this method
-        def count_explored_neighbors(node):
-            explored_count = 0
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, Down, Left, Right
-
-            for dx, dy in directions:
-                nx, ny = node.x + dx, node.y + dy
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    neighbor = grid[ny][nx]
-                    if neighbor in self.visited:
-                        explored_count += 1
-
-            return explored_count
-        # Sort the neighbors based on the number of explored neighbors (descending order)
-        return sorted(neighbors, key=count_explored_neighbors, reverse=True)
-
-    def is_connected(self, node_1, node_2): #ChatGPT wrote this method
-        # Check if there's already an edge between node_1 and node_2
-        return any(
-            {edge.node1, edge.node2} == {node_1, node_2}  # Compare nodes in the edge
-            for edge in self.edges
-        )
-    def generate_maze(self, grid):
-        # Randomly select start and end nodes on opposite edges
-        start_side = random.choice(['top', 'bottom', 'left', 'right'])
-        end_side = {'top': 'bottom', 'bottom': 'top', 'left': 'right', 'right': 'left'}[start_side]
-
-        # Select start node
-        if start_side == 'top':
-            self.start_node = grid[0][random.randint(0, self.width-1)]
-        elif start_side == 'bottom':
-            self.start_node = grid[self.height-1][random.randint(0, self.width-1)]
-        elif start_side == 'left':
-            self.start_node = grid[random.randint(0, self.height-1)][0]
-        else:  # right
-            self.start_node = grid[random.randint(0, self.height-1)][self.width-1]
-
-        # Select end node
-        if end_side == 'top':
-            self.end_node = grid[0][random.randint(0, self.width-1)]
-        elif end_side == 'bottom':
-            self.end_node = grid[self.height-1][random.randint(0, self.width-1)]
-        elif end_side == 'left':
-            self.end_node = grid[random.randint(0, self.height-1)][0]
-        else:  # right
-            self.end_node = grid[random.randint(0, self.height-1)][self.width-1]
-
-        # Mark start and end nodes
-        self.start_node.is_start = True
-        self.end_node.is_end = True
-
-        self.visited = set()
-        path = []
-
-        def dfs(current_node):
+        # "background" generates on a worker thread, streaming steps into self.step_log as they happen;
+        # "replay" generates headlessly into self.step_log and leaves the animating to replay.ReplayPlayer;
+        # "coords" grows one canvas item per corridor and only repaints at TARGET_FPS;
+        # "rectangles" is the original animate_rectangle, which adds new items every frame.
+        # The UI's Animation dropdown picks one of these before generate_maze is called.
+        self.animation_mode = "background"
+        self.step_log = None
+        self.job = None
+        self._last_frame = 0.0
+        self._marker_items = None
+
+    TARGET_FPS = 60
+
+    @property
+    def seed(self):
+        return self.generator.seed
+
+    @property
+    def grid(self):
+        return self.generator.grid
+
+    @property
+    def edges(self):
+        # Edge objects are built on demand from the grid's edge columns
+        return self.generator.edges
+
+    @property
+    def visited(self):
+        return self.generator.visited
+
+    def is_connected(self, node_1, node_2):
+        return self.generator.is_connected(node_1, node_2)
+
+    def add_edge(self, node1, node2):
+        return self.generator.add_edge(self.grid.cell(node1.x, node1.y), self.grid.cell(node2.x, node2.y))
+
+    def generate_maze(self, on_done=None):
+        """
+        Generates the maze in the current animation_mode.
+
+        Args:
+            on_done (callable, optional): Called with no arguments once the maze is finished. In "background"
+                mode that happens later, from the Tk main loop; the other modes call it before returning.
+
+        Returns:
+            tuple: (start_node, end_node), known as soon as this returns in every mode
+        """
+        if self.animation_mode == "background":
+            return self.generate_in_background(on_done)
+
+        if self.animation_mode == "replay":
+            # Phase one only: the whole DFS runs without drawing, the UI replays the log afterwards
+            self.step_log = StepLog.record(self.generator)
+            self.start_node, self.end_node = self.generator.start_node, self.generator.end_node
+            self.image = render_maze_image(self.grid, self.cell_width, self.offset_x, self.offset_y,
+                                           self.image.width, self.image.height)
+            print(f"Maze generation completed (seed {self.seed}, {len(self.step_log)} steps logged).")
+            if on_done is not None:
+                on_done()
+            return self.start_node, self.end_node
+
+        self.start_node, self.end_node = self.generator.choose_endpoints()
+
+        def draw_step(prev_cell, current_cell):
+            prev_node, current_node = self.grid.node(prev_cell), self.grid.node(current_cell)
+            if self.animation_mode == "coords":
+                self.animate_corridor(self.canvas, prev_node, current_node, self.cell_width//2)
+                draw_corridor(self.image.draw_rectangle, prev_node, current_node, self.cell_width//2,
+                              self.cell_width, self.offset_x, self.offset_y, self.start_node, self.end_node)
+                return
             self.master.update()
-            self.visited.add(current_node)
-            path.append(current_node)
-
-            if len(path) > 1:
-                prev_node = path[-2]
-                self.animate_rectangle(self.canvas, prev_node, current_node,
-                                       self.cell_width//2, self.canvas.create_rectangle)
-                self.quick_rectangle(self.canvas, prev_node, current_node,
-                                       self.cell_width//2, self.image.draw_rectangle)
-                self.edges.append(Edge(prev_node, current_node))
-
-            neighbors = self.get_unvisited_neighbors(current_node, grid)
-            if self.ui.bias.get()/100>random.random():
-                neighbors = self.parallel_bias(neighbors, grid)
-            for neighbor in neighbors:
-                if neighbor not in self.visited and self.add_edge(neighbor, current_node):
-                    dfs(neighbor)
-            path.pop()
-        dfs(self.start_node)
-        print("Maze generation completed.")
+            self.animate_rectangle(self.canvas, prev_node, current_node,
+                                   self.cell_width//2, self.canvas.create_rectangle)
+            self.quick_rectangle(self.canvas, prev_node, current_node,
+                                 self.cell_width//2, self.image.draw_rectangle)
+
+        self.generator.carve(on_carve=draw_step)
+        self.canvas.update()
+        print(f"Maze generation completed (seed {self.seed}).")
+        if on_done is not None:
+            on_done()
+        return self.start_node, self.end_node
+
+    def generate_in_background(self, on_done=None):
+        """
+        Runs the DFS (and the offscreen render) on a worker thread. Carve and backtrack events come back
+        through the job's queue in batches and are appended to self.step_log on the Tk thread,
+        so a ReplayPlayer can animate the log while it grows. Nothing here waits on drawing.
+
+        Args:
+            on_done (callable, optional): Called with no arguments from the Tk main loop when the maze is done.
+
+        Returns:
+            tuple: (start_node, end_node)
+        """
+        # The endpoints are picked here, so the markers can be drawn before any steps arrive
+        self.start_node, self.end_node = self.generator.choose_endpoints()
+        grid = self.grid
+        self.step_log = StepLog(grid.width, grid.height, grid.start, grid.end, self.seed)
+        self.step_log.complete = False
+        image_size = (self.image.width, self.image.height)
+
+        def work(job):
+            # Worker thread: only the generator and the job are touched here
+            self.generator.carve(on_carve=lambda prev_cell, cell: job.emit((CARVE, prev_cell, cell)),
+                                 on_backtrack=lambda prev_cell, cell: job.emit((BACKTRACK, prev_cell, cell)))
+            return render_maze_image(grid, self.cell_width, self.offset_x, self.offset_y, *image_size)
+
+        def add_events(events):
+            add = self.step_log.add
+            for kind, prev_cell, cell in events:
+                add(kind, prev_cell, cell)
+
+        def finished(image):
+            self.image = image
+            self.step_log.complete = True
+            self.job = None
+            print(f"Maze generation completed (seed {self.seed}, {len(self.step_log)} steps logged).")
+            if on_done is not None:
+                on_done()
+
+        self.job = BackgroundJob(self.master, work, add_events, finished).start()
         return self.start_node, self.end_node
 
-    def add_edge(self, node1, node2): #ChatGPT wrote this method
-        new_edge = Edge(node1, node2)
-        return not any(edge.is_sub_edge(new_edge) or new_edge.is_sub_edge(edge)
-                   for edge in self.edges)
+    def cancel(self):
+        # Stops a background generation; the worker thread gives up at its next step
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+
+    def use_step_log(self, log):
+        """
+        Takes over a maze from a saved step log instead of generating one, ready to be replayed.
+
+        Args:
+            log (StepLog): A log loaded from a .steps file; its size should match this MazeAlgorithm's.
+        """
+        self.step_log = log
+        self.generator.grid = log.to_grid()
+        self.generator.seed = log.seed
+        self.start_node = self.grid.node(log.start) if log.start >= 0 else None
+        self.end_node = self.grid.node(log.end) if log.end >= 0 else None
+        self.image = render_maze_image(self.grid, self.cell_width, self.offset_x, self.offset_y,
+                                       self.image.width, self.image.height)
+
+    @property
+    def render_settings(self):
+        # Everything besides the maze itself that decides what self.image looks like, for MazeCache.get_png
+        return ("canvas", self.cell_width, self.offset_x, self.offset_y, self.image.width, self.image.height)
+
+    def use_cached(self, grid, image=None):
+        """
+        Takes over a finished maze from the MazeCache instead of generating it, and draws it in one pass.
+
+        Args:
+            grid (MazeGrid): The cached maze; it is shared with the cache, so it is only read.
+            image (MazeImage, optional): Prerendered image for render_settings; rendered here if None.
+        """
+        self.step_log = None
+        self.generator.grid = grid
+        self.start_node, self.end_node = self.generator.start_node, self.generator.end_node
+        self.image = image or render_maze_image(grid, self.cell_width, self.offset_x, self.offset_y,
+                                                self.image.width, self.image.height)
+        draw_maze(self.canvas.create_rectangle, grid, self.cell_width, self.offset_x, self.offset_y)
+        self.canvas.update()
+
+    def draw_graph(self, graph):
+        """
+        Draws a maze read from a file in one pass: the offscreen image is rasterised once,
+        the canvas items are all created before a single repaint.
+
+        Args:
+            graph (MazeGraph): The parsed maze file.
+
+        Returns:
+            MazeImage: The base raster; take shared_copy()s of it for other images instead of redrawing.
+        """
+        base = render_graph_image(graph, self.cell_width, self.offset_x, self.offset_y,
+                                  self.image.width, self.image.height)
+        self.image = base.shared_copy()
+
+        width = self.cell_width // 2
+        for node1, node2, color in graph.corridors():
+            draw_corridor(self.canvas.create_rectangle, Node(*node1), Node(*node2), width,
+                          self.cell_width, self.offset_x, self.offset_y, color=color)
+        for node, color in ((self.start_node, "green"), (self.end_node, "red")):
+            if node is not None:
+                draw_marker(self.canvas.create_rectangle, node, width, self.cell_width,
+                            self.offset_x, self.offset_y, color)
+        self.canvas.update()
+        return base
 
     #EVERYTHING BELOW THIS was originally generated by Claude, but Max spent lots of time fixing its mistakes.
     #In fact, most lines were written by Max.
@@ -261,84 +358,102 @@ class MazeAlgorithm:
         draw_cell(grid2Coord(self.end_node)[0], grid2Coord(self.end_node)[1], color="red")
         canvas.update()
 
-    def quick_rectangle(self, canvas, node1, node2, width, draw_rectangle_func=None, color="white"):
-        # If no custom draw function provided, use default canvas.create_rectangle
-        if draw_rectangle_func is None:
-            draw_rectangle_func = canvas.create_rectangle
-
+    def animate_corridor(self, canvas, node1, node2, width, color="white"):
+        """
+        Same animation as animate_rectangle, but each corridor is one wall item and one
+        corridor item that grow with canvas.coords, so the canvas holds O(edges) items
+        instead of a few new rectangles per frame. Repaints are coalesced to TARGET_FPS.
+        """
         def grid2Coord(node):
             return (node.x * self.cell_width + self.cell_width/2 + self.offset_x, node.y * self.cell_width + self.cell_width/2 + self.offset_y)
 
         black_border = 3
+        MAX_SPEED = 60
+        d = max(round(self.speed_var.get()/100*MAX_SPEED), 1)
         x1, y1 = grid2Coord(node1)
         x2, y2 = grid2Coord(node2)
 
-        dx = 1 if x2 > x1 else -1 if x2 < x1 else 0
-        dy = 1 if y2 > y1 else -1 if y2 < y1 else 0
-
-        def draw_cell(x, y, color="white"):
-            draw_rectangle_func(
-                x - width // 2 + black_border,
-                y - width // 2 + black_border,
-                x + width // 2 - black_border,
-                y + width // 2 - black_border,
-                fill=color,
-                outline=""
-            )
+        dx = d if x2 > x1 else -d if x2 < x1 else 0
+        dy = d if y2 > y1 else -d if y2 < y1 else 0
 
-        draw_rectangle_func(
-            x2 - width // 2, y2 - width // 2,
-            x2 + width // 2, y2 + width // 2,
-            fill="black", outline=""
+        wall = canvas.create_rectangle(x1, y1, x1, y1, fill="black", outline="")
+        corridor = canvas.create_rectangle(x1, y1, x1, y1, fill=color, outline="")
+        head = canvas.create_rectangle(
+            x2 - width // 2 + black_border, y2 - width // 2 + black_border,
+            x2 + width // 2 - black_border, y2 + width // 2 - black_border,
+            fill="blue", outline=""
         )
 
+        current_x, current_y = x1, y1
+        while abs(current_x - x2)>abs(dx) or abs(current_y - y2)>abs(dy):
+            if dx == 0:
+                if abs(current_y - y1)>abs(width):
+                    canvas.coords(wall,
+                                  current_x - width // 2, max(y1, current_y)-width//2,
+                                  current_x + width // 2, min(y1, current_y)+width//2)
+                canvas.coords(corridor,
+                              current_x - (width // 2 - black_border), min(y1, current_y),
+                              current_x + (width // 2 - black_border), max(current_y, y1))
+            else:
+                if abs(current_x - x1)>abs(width):
+                    canvas.coords(wall,
+                                  max(x1, current_x)-width//2, current_y - width // 2,
+                                  min(x1, current_x)+width//2, current_y + width // 2)
+                canvas.coords(corridor,
+                              min(x1, current_x), current_y - (width // 2 - black_border),
+                              max(current_x, x1), current_y + (width // 2 - black_border))
+            self._frame_update(canvas)
+
+            current_x += dx
+            current_y += dy
+
+        # Final shape: the blue head becomes the black cell under everything else of this corridor
+        canvas.coords(head, x2 - width // 2, y2 - width // 2, x2 + width // 2, y2 + width // 2)
+        canvas.itemconfigure(head, fill="black")
+        canvas.tag_lower(head, wall)
+
         bb = black_border if dx > 0 or dy > 0 else 0
         nbb = 0 if bb else -black_border
         if dx == 0:
-            draw_rectangle_func(
-                x2 - width // 2,
-                min(y2, y1) + width//2,
-                x2 + width // 2,
-                max(y2, y1) - width//2,
-                fill="black", outline=""
-            )
-            draw_rectangle_func(
-                x2 - width // 2 + black_border,
-                y2 - width//2 - nbb,
-                x2 + width // 2 - black_border,
-                y2 + width // 2 - bb,
-                fill=color, outline=""
-            )
-            draw_rectangle_func(
-                x2 - width // 2 + black_border,
-                min(y2, y1),
-                x2 + width // 2 - black_border,
-                max(y2, y1),
-                fill=color, outline=""
-            )
+            canvas.coords(wall, x2 - width // 2, min(y2, y1) + width//2, x2 + width // 2, max(y2, y1) - width//2)
+            canvas.coords(corridor, x2 - width // 2 + black_border, min(y2, y1), x2 + width // 2 - black_border, max(y2, y1))
+            canvas.create_rectangle(x2 - width // 2 + black_border, y2 - width//2 - nbb,
+                                    x2 + width // 2 - black_border, y2 + width // 2 - bb,
+                                    fill=color, outline="")
         else:
-            draw_rectangle_func(
-                min(x2, x1) + width // 2,
-                y2 - width // 2,
-                max(x2, x1) - width//2,
-                y2 + width // 2,
-                fill="black", outline=""
-            )
-            draw_rectangle_func(
-                x2 - width // 2 - nbb,
-                y2 - width // 2 + black_border,
-                x2 + width // 2 - bb,
-                y2 + width // 2 - black_border,
-                fill=color, outline=""
-            )
-            draw_rectangle_func(
-                min(x2, x1),
-                y2 - width // 2 + black_border,
-                max(x2, x1),
-                y2 + width // 2 - black_border,
-                fill=color, outline=""
-            )
+            canvas.coords(wall, min(x2, x1) + width // 2, y2 - width // 2, max(x2, x1) - width//2, y2 + width // 2)
+            canvas.coords(corridor, min(x2, x1), y2 - width // 2 + black_border, max(x2, x1), y2 + width // 2 - black_border)
+            canvas.create_rectangle(x2 - width // 2 - nbb, y2 - width // 2 + black_border,
+                                    x2 + width // 2 - bb, y2 + width // 2 - black_border,
+                                    fill=color, outline="")
+
+        self._raise_markers(canvas, width, black_border)
+        self._frame_update(canvas)
+
+    def _raise_markers(self, canvas, width, black_border):
+        # One start and one end marker per maze, raised back on top instead of redrawn
+        if self._marker_items is None:
+            items = []
+            for node, color in ((self.start_node, "green"), (self.end_node, "red")):
+                draw_marker(lambda *coords, **options: items.append(canvas.create_rectangle(*coords, **options)),
+                            node, width, self.cell_width, self.offset_x, self.offset_y, color, black_border)
+            self._marker_items = items
+        for item in self._marker_items:
+            canvas.tag_raise(item)
+
+    def _frame_update(self, canvas):
+        # Only let Tk repaint (and handle events) once per frame at TARGET_FPS
+        now = time.perf_counter()
+        if now - self._last_frame >= 1 / self.TARGET_FPS:
+            self._last_frame = now
+            canvas.update()
 
-        draw_cell(grid2Coord(self.start_node)[0], grid2Coord(self.start_node)[1], color="green")
-        draw_cell(grid2Coord(self.end_node)[0], grid2Coord(self.end_node)[1], color="red")
-        canvas.update()
\ No newline at end of file
+    def quick_rectangle(self, canvas, node1, node2, width, draw_rectangle_func=None, color="white"):
+        # If no custom draw function provided, use default canvas.create_rectangle
+        if draw_rectangle_func is None:
+            draw_rectangle_func = canvas.create_rectangle
+
+        # The rectangle math lives in render.py so it can run without a canvas
+        draw_corridor(draw_rectangle_func, node1, node2, width, self.cell_width, self.offset_x, self.offset_y,
+                      self.start_node, self.end_node, color)
+        canvas.update()
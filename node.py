@@ -3,6 +3,8 @@
 #Max carefully reviewed the is_sub_edge method to troubleshoot path overlapping.
 
 class Node:
+    __slots__ = ("x", "y", "is_start", "is_end")
+
     def __init__(self, x, y, is_start=False, is_end=False):
         self.x, self.y = x, y
         self.is_start = is_start
@@ -12,6 +14,8 @@ class Node:
 
 
 class Edge:
+    __slots__ = ("node1", "node2", "color")
+
     def __init__(self, node1, node2, color="white"):
         if not (isinstance(node1, Node) and isinstance(node2, Node)):
             raise TypeError("Both arguments must be instances of Node.")
@@ -35,4 +39,4 @@ class Edge:
             other_range = sorted([other.node1.y, other.node2.y])
 
         # Check for overlap
-        return not (self_range[1] <= other_range[0] or self_range[0] >= other_range[1])
\ No newline at end of file
+        return not (self_range[1] <= other_range[0] or self_range[0] >= other_range[1])
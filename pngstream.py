@@ -0,0 +1,104 @@
+#This file writes PNGs a few rows at a time, for maze posters too big to hold as one image.
+#The chunks are built by hand (IHDR, PLTE, IDAT, IEND) and the pixel data goes through one zlib stream,
+#so memory only ever holds the rows being written plus zlib's window.
+
+import struct
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # Only needed once a writer is made
+    np = None
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IDAT_SIZE = 1 << 16  # Compressed bytes collected before an IDAT chunk is written
+MODES = ("rgb", "palette", "1bit")
+
+class PNGStreamWriter:
+    def __init__(self, file, width, height, palette, mode="palette", compression=6):
+        """
+        Starts a PNG in an open binary file. Rows come in as palette indices through write_rows.
+
+        :param file: File object opened for binary writing
+        :param width: Image width in pixels
+        :param height: Image height in pixels
+        :param palette: List of (r, g, b) colours; row values index into it (at most 16 for "palette")
+        :param mode: "rgb" (24-bit), "palette" (4-bit indexed) or "1bit" (index 0 black, everything else white)
+        :param compression: zlib level
+        """
+        if np is None:
+            raise ImportError("The streaming PNG writer needs NumPy")
+        if mode not in MODES:
+            raise ValueError(f"Unknown PNG mode: {mode}")
+        if mode == "palette" and len(palette) > 16:
+            raise ValueError("The 4-bit palette mode holds at most 16 colours")
+        self.file = file
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.palette = np.array(palette, dtype=np.uint8)
+        self.rows_written = 0
+        self.compressor = zlib.compressobj(compression)
+        self.pending = []
+        self.pending_size = 0
+
+        if mode == "rgb":
+            bit_depth, color_type = 8, 2
+        elif mode == "palette":
+            bit_depth, color_type = 4, 3
+        else:
+            bit_depth, color_type = 1, 0
+        self.file.write(PNG_SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0))
+        if mode == "palette":
+            self._chunk(b"PLTE", self.palette.tobytes())
+
+    def _chunk(self, kind, data):
+        self.file.write(struct.pack(">I", len(data)))
+        self.file.write(kind)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xffffffff))
+
+    def _encode(self, rows):
+        # Turns an (n, width) array of palette indices into scanline bytes, without the filter byte
+        if self.mode == "rgb":
+            return self.palette[rows].reshape(len(rows), -1)
+        if self.mode == "1bit":
+            return np.packbits(rows != 0, axis=1)
+        if self.width % 2:
+            rows = np.pad(rows, ((0, 0), (0, 1)))
+        return (rows[:, 0::2] << 4) | rows[:, 1::2]
+
+    def write_rows(self, rows):
+        """
+        Adds the next rows of the image.
+
+        :param rows: (n, width) uint8 array of palette indices
+        """
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError("More rows than the image height")
+        scanlines = self._encode(rows)
+        # Filter type 0 (none) in front of every scanline
+        data = np.zeros((len(rows), scanlines.shape[1] + 1), dtype=np.uint8)
+        data[:, 1:] = scanlines
+        compressed = self.compressor.compress(data.tobytes())
+        self.rows_written += len(rows)
+        if compressed:
+            self.pending.append(compressed)
+            self.pending_size += len(compressed)
+            if self.pending_size >= IDAT_SIZE:
+                self._flush_idat()
+
+    def _flush_idat(self):
+        if self.pending:
+            self._chunk(b"IDAT", b"".join(self.pending))
+        self.pending = []
+        self.pending_size = 0
+
+    def close(self):
+        """Finishes the zlib stream and writes the last chunks. The file itself is left open."""
+        if self.rows_written != self.height:
+            raise ValueError(f"Wrote {self.rows_written} rows of {self.height}")
+        self.pending.append(self.compressor.flush())
+        self._flush_idat()
+        self._chunk(b"IEND", b"")
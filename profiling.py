@@ -0,0 +1,197 @@
+#This file is the opt-in profiler. Nothing is measured until enable() is called, because enabling is what
+#wraps the methods: with profiling off the classes are untouched, so there is no cost at all.
+#Each wrapped method counts its calls and adds up its time (inclusive, so generate_maze includes add_edge).
+#Usage:
+#   MAZE_PROFILE=1 python main.py                     (summary table after every generation/solve)
+#   MAZE_PROFILE=1 MAZE_PROFILE_OUTPUT=runs.jsonl python main.py   (also one JSON line per run)
+#   python profiling.py --size 200x200 --cprofile gen.pstats       (one headless generation, optional cProfile)
+
+import argparse
+import cProfile
+import functools
+import importlib
+import json
+import os
+import pstats
+import sys
+import time
+from collections import defaultdict
+
+# "module:Class.method" for every phase that gets timed; modules are only imported when profiling is enabled
+DEFAULT_TARGETS = [
+    "generator:MazeGenerator.choose_endpoints",
+    "generator:MazeGenerator.carve",
+    "generator:MazeGenerator.get_unvisited_neighbors",
+    "generator:MazeGenerator.parallel_bias",
+    "generator:MazeGenerator.add_edge",
+    "generator:MazeGenerator.mark_segment",
+    "maze:MazeAlgorithm.generate_maze",
+    "maze:MazeAlgorithm.animate_rectangle",
+    "maze:MazeAlgorithm.animate_corridor",
+    "maze:MazeAlgorithm.quick_rectangle",
+    "maze:MazeAlgorithm.draw_graph",
+    "load:MazeImage.draw_rectangle",
+    "load:MazeImage.draw_ellipse",
+    "load:MazeImage.draw_line",
+    "load:MazeImage.save_image",
+    "render:RasterImage.fill_rectangles",
+    "render:RasterImage.to_image",
+    "replay:ReplayPlayer.seek",
+    "solver:MazeSolver.solve",
+    "solver:MazeSolver._draw_on_canvas",
+    "solver:MazeSolver._draw_on_image",
+    "solver:DepthFirstSolver.search",
+    "solver:BreadthFirstSolver.search",
+    "solver:AStarSolver.search",
+    "solver:BidirectionalSolver.search",
+    "tkinter:Canvas.create_rectangle",
+    "tkinter:Canvas.coords",
+    "tkinter:Misc.update",
+]
+
+class Profiler:
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.enabled = False
+        self.output = None  # File that gets one JSON line per report_run()
+        self._patched = []
+
+    def enable(self, targets=None):
+        """
+        Wraps every target method with a counter and a timer.
+
+        :param targets: List of "module:Class.method" strings; defaults to DEFAULT_TARGETS.
+                        Targets whose module isn't importable (e.g. tkinter on a build host) are skipped.
+        """
+        if self.enabled:
+            return
+        for target in targets or DEFAULT_TARGETS:
+            module_name, attribute = target.split(":")
+            class_name, method_name = attribute.split(".")
+            try:
+                owner = getattr(importlib.import_module(module_name), class_name)
+            except (ImportError, AttributeError):
+                continue
+            original = owner.__dict__.get(method_name)
+            if original is None:
+                continue
+            setattr(owner, method_name, self._wrap(f"{class_name}.{method_name}", original))
+            self._patched.append((owner, method_name, original))
+        self.enabled = True
+
+    def disable(self):
+        """Puts the original methods back."""
+        for owner, method_name, original in reversed(self._patched):
+            setattr(owner, method_name, original)
+        self._patched = []
+        self.enabled = False
+
+    def _wrap(self, label, func):
+        calls, seconds, clock = self.calls, self.seconds, time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            began = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds[label] += clock() - began
+                calls[label] += 1
+        return wrapper
+
+    def reset(self):
+        self.calls.clear()
+        self.seconds.clear()
+
+    def stats(self):
+        """
+        :return: {phase: {"calls": n, "total_s": seconds, "mean_us": microseconds per call}}, slowest first
+        """
+        phases = sorted(self.calls, key=lambda label: self.seconds[label], reverse=True)
+        return {label: {"calls": self.calls[label],
+                        "total_s": self.seconds[label],
+                        "mean_us": self.seconds[label] / self.calls[label] * 1e6}
+                for label in phases}
+
+    def summary(self, title="Profile"):
+        lines = [f"{title}:", f'{"phase":<40} {"calls":>10} {"total s":>10} {"mean us":>10}']
+        for label, phase in self.stats().items():
+            lines.append(f'{label:<40} {phase["calls"]:>10} {phase["total_s"]:>10.4f} {phase["mean_us"]:>10.1f}')
+        return "\n".join(lines)
+
+    def dump_json(self, file_path, run=None):
+        with open(file_path, "w") as f:
+            json.dump({"run": run, "phases": self.stats()}, f, indent=2)
+
+    def report_run(self, run):
+        """
+        End of a run (a generation, an import, a solve): prints the table, appends a JSON line to
+        self.output if set, and starts counting afresh. Does nothing while profiling is off.
+
+        :param run: Name of the run for the table title and the JSON line
+        """
+        if not self.enabled:
+            return
+        print(self.summary(f"Profile of {run}"))
+        if self.output:
+            with open(self.output, "a") as f:
+                f.write(json.dumps({"run": run, "time": time.time(), "phases": self.stats()}) + "\n")
+        self.reset()
+
+profiler = Profiler()
+
+def enable_from_environment():
+    # MAZE_PROFILE turns profiling on; MAZE_PROFILE_OUTPUT also collects the runs as JSON lines
+    if os.environ.get("MAZE_PROFILE"):
+        profiler.output = os.environ.get("MAZE_PROFILE_OUTPUT")
+        profiler.enable()
+
+def profile_call(func, *args, output=None, sort="cumulative", limit=25, **kwargs):
+    """
+    Runs one call under cProfile and prints the top functions.
+
+    :param output: Also save the raw stats here (open with pstats or snakeviz)
+    :param sort: pstats sort key
+    :param limit: Number of rows to print
+    :return: Whatever func returned
+    """
+    capture = cProfile.Profile()
+    result = capture.runcall(func, *args, **kwargs)
+    if output:
+        capture.dump_stats(output)
+    pstats.Stats(capture).sort_stats(sort).print_stats(limit)
+    return result
+
+def main(argv=None):
+    from batch import parse_size
+    from generator import MazeGenerator
+
+    parser = argparse.ArgumentParser(description="Profile one headless maze generation.")
+    parser.add_argument("--size", type=parse_size, default=(100, 100), help="Maze size such as 100x100")
+    parser.add_argument("--reach", type=float, default=25, help="Reach (%%)")
+    parser.add_argument("--bias", type=float, default=0, help="Parallel bias (%%)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Write the per-phase counters to this JSON file")
+    parser.add_argument("--cprofile", nargs="?", const="", default=None,
+                        help="Run under cProfile instead (optionally saving the stats to this file)")
+    args = parser.parse_args(argv)
+
+    width, height = args.size
+    generator = MazeGenerator(width, height, args.reach, args.bias, args.seed)
+    if args.cprofile is not None:
+        profile_call(generator.generate, output=args.cprofile or None)
+        return 0
+
+    profiler.enable()
+    try:
+        generator.generate()
+    finally:
+        profiler.disable()
+    print(profiler.summary(f"Profile of a {width}x{height} generation (seed {args.seed})"))
+    if args.json:
+        profiler.dump_json(args.json, run="generate")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,447 @@
+#This file holds the corridor drawing that used to live only in MazeAlgorithm.quick_rectangle.
+#Pulling it out lets a MazeImage be drawn without a canvas (benchmarks, batch exports).
+#The rectangle math is Max's, unchanged; MazeAlgorithm.quick_rectangle now calls draw_corridor.
+#export_maze_image renders at its own cell size, so exports no longer depend on the window size.
+#export_maze_png_streaming writes one PNG strip by strip for posters too big to hold in memory.
+#RasterImage replays the same rectangles into a NumPy array, which is much cheaper than PIL draw calls for exports.
+
+import os
+
+from PIL import Image
+from load import MazeImage
+from node import Node
+from pngstream import PNGStreamWriter
+
+try:
+    import numpy as np
+except ImportError:  # render_maze_image falls back to drawing with PIL
+    np = None
+
+# Every colour the maze drawing uses, in palette order (same RGB values PIL gives these names)
+PALETTE = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "green": (0, 128, 0),
+    "red": (255, 0, 0),
+    "blue": (0, 0, 255),
+    "purple": (128, 0, 128),
+}
+COLOR_INDEX = {name: index for index, name in enumerate(PALETTE)}
+
+DEFAULT_PIXELS_PER_CELL = 20
+TILE_SIZE = 4096  # Exports bigger than this on either side are split into tiles
+STRIP_HEIGHT = 256  # Rows rendered at a time by the streaming exporter
+
+def draw_corridor(draw_rectangle_func, node1, node2, width, cell_width, offset_x, offset_y,
+                  start_node=None, end_node=None, color="white", black_border=3):
+    """
+    Draws the corridor from node1 to node2, then the start/end markers if they are given.
+
+    :param draw_rectangle_func: Called as (x1, y1, x2, y2, fill=..., outline=...) for every rectangle
+    :param width: Corridor width in pixels (the UI uses cell_width // 2)
+    :param cell_width: Size of a cell in pixels
+    :param offset_x, offset_y: Pixel position of the maze's top-left corner
+    """
+    def grid2Coord(node):
+        return (node.x * cell_width + cell_width/2 + offset_x, node.y * cell_width + cell_width/2 + offset_y)
+
+    x1, y1 = grid2Coord(node1)
+    x2, y2 = grid2Coord(node2)
+
+    dx = 1 if x2 > x1 else -1 if x2 < x1 else 0
+    dy = 1 if y2 > y1 else -1 if y2 < y1 else 0
+
+    draw_rectangle_func(
+        x2 - width // 2, y2 - width // 2,
+        x2 + width // 2, y2 + width // 2,
+        fill="black", outline=""
+    )
+
+    bb = black_border if dx > 0 or dy > 0 else 0
+    nbb = 0 if bb else -black_border
+    if dx == 0:
+        draw_rectangle_func(
+            x2 - width // 2,
+            min(y2, y1) + width//2,
+            x2 + width // 2,
+            max(y2, y1) - width//2,
+            fill="black", outline=""
+        )
+        draw_rectangle_func(
+            x2 - width // 2 + black_border,
+            y2 - width//2 - nbb,
+            x2 + width // 2 - black_border,
+            y2 + width // 2 - bb,
+            fill=color, outline=""
+        )
+        draw_rectangle_func(
+            x2 - width // 2 + black_border,
+            min(y2, y1),
+            x2 + width // 2 - black_border,
+            max(y2, y1),
+            fill=color, outline=""
+        )
+    else:
+        draw_rectangle_func(
+            min(x2, x1) + width // 2,
+            y2 - width // 2,
+            max(x2, x1) - width//2,
+            y2 + width // 2,
+            fill="black", outline=""
+        )
+        draw_rectangle_func(
+            x2 - width // 2 - nbb,
+            y2 - width // 2 + black_border,
+            x2 + width // 2 - bb,
+            y2 + width // 2 - black_border,
+            fill=color, outline=""
+        )
+        draw_rectangle_func(
+            min(x2, x1),
+            y2 - width // 2 + black_border,
+            max(x2, x1),
+            y2 + width // 2 - black_border,
+            fill=color, outline=""
+        )
+
+    if start_node is not None:
+        draw_marker(draw_rectangle_func, start_node, width, cell_width, offset_x, offset_y, "green", black_border)
+    if end_node is not None:
+        draw_marker(draw_rectangle_func, end_node, width, cell_width, offset_x, offset_y, "red", black_border)
+
+def draw_marker(draw_rectangle_func, node, width, cell_width, offset_x, offset_y, color, black_border=3):
+    x = node.x * cell_width + cell_width/2 + offset_x
+    y = node.y * cell_width + cell_width/2 + offset_y
+    draw_rectangle_func(
+        x - width // 2 + black_border,
+        y - width // 2 + black_border,
+        x + width // 2 - black_border,
+        y + width // 2 - black_border,
+        fill=color,
+        outline=""
+    )
+
+class RasterImage:
+    CHUNK = 4096  # Rectangles handed to Python per fill_rectangles batch
+
+    def __init__(self, width, height):
+        """
+        A uint8 array of palette indices that takes the same draw_rectangle calls as MazeImage.
+        Each rectangle is one NumPy slice assignment instead of a PIL draw call.
+
+        :param width: Width of the image
+        :param height: Height of the image
+        """
+        if np is None:
+            raise ImportError("The raster renderer needs NumPy")
+        self.width = width
+        self.height = height
+        self.pixels = np.zeros((height, width), dtype=np.uint8)  # All black
+
+    def draw_rectangle(self, x1, y1, x2, y2, fill="white", outline=""):
+        # PIL truncates the corners to ints and fills both edges inclusively; negative starts are clipped
+        left, right = int(min(x1, x2)), int(max(x1, x2))
+        top, bottom = int(min(y1, y2)), int(max(y1, y2))
+        if right < 0 or bottom < 0:
+            return
+        self.pixels[max(top, 0):bottom + 1, max(left, 0):right + 1] = COLOR_INDEX[fill]
+
+    def fill_rectangles(self, rectangles, colors, origin_x=0, origin_y=0):
+        """
+        Paints many rectangles in order. Rectangles that miss the raster are skipped.
+
+        :param rectangles: (n, 4) int array of top, bottom, left, right in full-image pixels (ends exclusive)
+        :param colors: Palette index for each rectangle
+        :param origin_x, origin_y: Full-image pixel at this raster's top-left corner (for tiles)
+        """
+        shifted = rectangles - np.array([origin_y, origin_y, origin_x, origin_x], dtype=rectangles.dtype)
+        hits = ((shifted[:, 1] > 0) & (shifted[:, 0] < self.height) &
+                (shifted[:, 3] > 0) & (shifted[:, 2] < self.width))
+        shifted, colors = np.maximum(shifted[hits], 0), colors[hits]
+        pixels = self.pixels
+        # Converted to Python ints a chunk at a time; a list of every rectangle costs more than the raster
+        for begin in range(0, len(shifted), self.CHUNK):
+            chunk = zip(shifted[begin:begin + self.CHUNK].tolist(), colors[begin:begin + self.CHUNK].tolist())
+            for (top, bottom, left, right), color in chunk:
+                pixels[top:bottom, left:right] = color
+
+    def to_image(self):
+        """Converts the raster to an RGB MazeImage in one go."""
+        image = Image.frombytes("P", (self.width, self.height), self.pixels.tobytes())
+        image.putpalette([channel for color in PALETTE.values() for channel in color])
+        return MazeImage.from_image(image.convert("RGB"))
+
+def _bounds(x1, y1, x2, y2):
+    # Same rounding as RasterImage.draw_rectangle, for whole arrays of corners; ends become exclusive
+    left = np.trunc(np.minimum(x1, x2)).astype(np.int32)
+    right = np.trunc(np.maximum(x1, x2)).astype(np.int32) + 1
+    top = np.trunc(np.minimum(y1, y2)).astype(np.int32)
+    bottom = np.trunc(np.maximum(y1, y2)).astype(np.int32) + 1
+    return np.stack([top, bottom, left, right], axis=-1)
+
+def corridor_rectangles(x1, y1, x2, y2, cell_width, offset_x=0, offset_y=0, colors=None, black_border=3):
+    """
+    Works out every rectangle draw_corridor would draw for a list of corridors, all at once.
+    Rows come out in drawing order, so painting them in order gives the same pixels.
+
+    :param x1, y1, x2, y2: Int arrays of the corridors' cell coordinates, node1 -> node2
+    :param colors: Palette index of each corridor; None means all white
+    :return: (rectangles, colors) - an (n, 4) array from _bounds and COLOR_INDEX values
+    """
+    half = cell_width // 2 // 2
+    x1 = x1 * cell_width + cell_width / 2 + offset_x
+    y1 = y1 * cell_width + cell_width / 2 + offset_y
+    x2 = x2 * cell_width + cell_width / 2 + offset_x
+    y2 = y2 * cell_width + cell_width / 2 + offset_y
+
+    vertical = x2 == x1
+    bb = np.where((x2 > x1) | (y2 > y1), black_border, 0)
+    nbb = np.where(bb != 0, 0, -black_border)
+    low_x, high_x = np.minimum(x1, x2), np.maximum(x1, x2)
+    low_y, high_y = np.minimum(y1, y2), np.maximum(y1, y2)
+
+    square = _bounds(x2 - half, y2 - half, x2 + half, y2 + half)
+    gap = np.where(vertical[:, None],
+                   _bounds(x2 - half, low_y + half, x2 + half, high_y - half),
+                   _bounds(low_x + half, y2 - half, high_x - half, y2 + half))
+    end = np.where(vertical[:, None],
+                   _bounds(x2 - half + black_border, y2 - half - nbb, x2 + half - black_border, y2 + half - bb),
+                   _bounds(x2 - half - nbb, y2 - half + black_border, x2 + half - bb, y2 + half - black_border))
+    span = np.where(vertical[:, None],
+                    _bounds(x2 - half + black_border, low_y, x2 + half - black_border, high_y),
+                    _bounds(low_x, y2 - half + black_border, high_x, y2 + half - black_border))
+    rectangles = np.stack([square, gap, end, span], axis=1).reshape(-1, 4)
+
+    if colors is None:
+        colors = np.full(len(x1), COLOR_INDEX["white"], dtype=np.uint8)
+    rectangle_colors = np.empty((len(x1), 4), dtype=np.uint8)
+    rectangle_colors[:, :2] = COLOR_INDEX["black"]
+    rectangle_colors[:, 2] = colors
+    rectangle_colors[:, 3] = colors
+    return rectangles, rectangle_colors.reshape(-1)
+
+def marker_rectangles(markers, cell_width, offset_x=0, offset_y=0, black_border=3):
+    """
+    The rectangles draw_marker would draw.
+
+    :param markers: List of ((x, y), color name); a None node is skipped
+    :return: (rectangles, colors) like corridor_rectangles
+    """
+    half = cell_width // 2 // 2
+    rectangles, colors = [np.empty((0, 4), dtype=np.int32)], [np.empty(0, dtype=np.uint8)]
+    for node, color in markers:
+        if node is None:
+            continue
+        x = node[0] * cell_width + cell_width / 2 + offset_x
+        y = node[1] * cell_width + cell_width / 2 + offset_y
+        rectangles.append(_bounds(np.array([x - half + black_border]), np.array([y - half + black_border]),
+                                  np.array([x + half - black_border]), np.array([y + half - black_border])))
+        colors.append(np.array([COLOR_INDEX[color]], dtype=np.uint8))
+    return np.concatenate(rectangles), np.concatenate(colors)
+
+def _join(*parts):
+    return np.concatenate([rectangles for rectangles, _ in parts]), np.concatenate([colors for _, colors in parts])
+
+def maze_rectangles(grid, cell_width, offset_x=0, offset_y=0, black_border=3, edges=None):
+    """
+    Works out every rectangle draw_maze would draw, all at once: the corridors in carve order,
+    then the start/end markers. Painting them in order gives the same pixels as draw_maze.
+
+    :param edges: Indices of the edges to include, in carve order (see edge_strips); None means all of them
+    :return: (rectangles, colors) like corridor_rectangles
+    """
+    cells_from = np.frombuffer(grid.edge_from, dtype=np.int32)
+    cells_to = np.frombuffer(grid.edge_to, dtype=np.int32)
+    if edges is not None:
+        cells_from, cells_to = cells_from[edges], cells_to[edges]
+    corridors = corridor_rectangles(cells_from % grid.width, cells_from // grid.width,
+                                    cells_to % grid.width, cells_to // grid.width,
+                                    cell_width, offset_x, offset_y, black_border=black_border)
+    markers = marker_rectangles([(grid.coords(grid.start) if grid.start >= 0 else None, "green"),
+                                 (grid.coords(grid.end) if grid.end >= 0 else None, "red")],
+                                cell_width, offset_x, offset_y, black_border)
+    return _join(corridors, markers)
+
+def edge_strips(grid, cell_width, strip_height, black_border=3):
+    """
+    Sorts the edges into the horizontal strips of a (cell_width per cell, no offset) image that they draw into,
+    so each strip's rectangles can be built from its own edges instead of from the whole maze.
+    A corridor crossing several strips is listed in each of them; within a strip edges stay in carve order.
+
+    :param strip_height: Pixel rows per strip
+    :return: (strip numbers, edge indices), parallel int arrays sorted by strip; slice them with strip_slice
+    """
+    cells_from = np.frombuffer(grid.edge_from, dtype=np.int32)
+    cells_to = np.frombuffer(grid.edge_to, dtype=np.int32)
+    # A corridor's rectangles stay within its cells' rows, apart from the border overhang on tiny cells
+    margin = black_border + 1
+    first = (np.minimum(cells_from, cells_to) // grid.width * cell_width - margin) // strip_height
+    last = ((np.maximum(cells_from, cells_to) // grid.width + 1) * cell_width + margin) // strip_height
+    counts = last - first + 1
+
+    # One entry per (strip, edge) pair; everything stays int32 so the index is a few bytes per edge
+    edges = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+    strips = np.arange(len(edges), dtype=np.int32)
+    strips -= np.repeat(np.cumsum(counts, dtype=np.int32) - counts - first, counts)
+    order = np.argsort(strips, kind="stable")
+    return strips[order], edges[order]
+
+def strip_slice(strips, edges, number):
+    # The edges of one strip from edge_strips
+    begin, end = np.searchsorted(strips, [number, number + 1])
+    return edges[begin:end]
+
+def draw_maze(draw_rectangle_func, grid, cell_width, offset_x=0, offset_y=0):
+    # Every corridor in carve order, then the start/end markers once on top
+    width = cell_width // 2
+    for cell1, cell2 in grid.iter_edges():
+        draw_corridor(draw_rectangle_func, grid.node(cell1), grid.node(cell2), width,
+                      cell_width, offset_x, offset_y)
+    if grid.start >= 0:
+        draw_marker(draw_rectangle_func, grid.node(grid.start), width, cell_width, offset_x, offset_y, "green")
+    if grid.end >= 0:
+        draw_marker(draw_rectangle_func, grid.node(grid.end), width, cell_width, offset_x, offset_y, "red")
+
+def render_maze_image(grid, cell_width, offset_x=0, offset_y=0, image_width=None, image_height=None,
+                      renderer=None):
+    """
+    Draws a whole generated maze onto a new MazeImage without touching Tk.
+    The markers are drawn once at the end, which leaves the same pixels as
+    quick_rectangle redrawing them after every corridor.
+
+    :param grid: MazeGrid with the carved edges
+    :param cell_width: Size of a cell in pixels
+    :param renderer: "raster" (NumPy array, converted to PIL once) or "pil" (PIL draw calls);
+                     None picks "raster" when NumPy is installed. Both give identical pixels.
+    :return: MazeImage
+    """
+    if renderer is None:
+        renderer = "raster" if np is not None else "pil"
+    width = image_width or grid.width * cell_width + 2 * offset_x
+    height = image_height or grid.height * cell_width + 2 * offset_y
+
+    if renderer == "raster":
+        raster = RasterImage(width, height)
+        raster.fill_rectangles(*maze_rectangles(grid, cell_width, offset_x, offset_y))
+        return raster.to_image()
+    if renderer == "pil":
+        image = MazeImage(width, height)
+        draw_maze(image.draw_rectangle, grid, cell_width, offset_x, offset_y)
+        return image
+    raise ValueError(f"Unknown renderer: {renderer}")
+
+def cell_size_for(grid, pixels_per_cell=None, max_dimension=None):
+    """
+    Picks the export cell size. With both arguments the smaller size wins; with neither it is DEFAULT_PIXELS_PER_CELL.
+
+    :param pixels_per_cell: Exact cell size in pixels
+    :param max_dimension: Largest width/height the image may have; the cell size is the biggest that fits
+    :return: Cell size in pixels (at least 1)
+    """
+    if max_dimension is not None:
+        fit = max_dimension // max(grid.width, grid.height)
+        pixels_per_cell = fit if pixels_per_cell is None else min(pixels_per_cell, fit)
+    elif pixels_per_cell is None:
+        pixels_per_cell = DEFAULT_PIXELS_PER_CELL
+    return max(1, pixels_per_cell)
+
+def export_maze_image(grid, filename, pixels_per_cell=None, max_dimension=None, tile_size=TILE_SIZE):
+    """
+    Writes a PNG of the maze at a chosen resolution, independent of any canvas.
+    Images wider or taller than tile_size are written as a set of tiles instead of one file
+    (filename_r<row>_c<column>.png), rendered one at a time so memory stays at about one tile.
+
+    :param grid: MazeGrid with the carved edges
+    :param filename: Path of the PNG (the tiles' names are built from it)
+    :param pixels_per_cell, max_dimension: See cell_size_for
+    :param tile_size: Largest tile side in pixels
+    :return: List of the files written
+    """
+    cell_width = cell_size_for(grid, pixels_per_cell, max_dimension)
+    width, height = grid.width * cell_width, grid.height * cell_width
+
+    if np is None or (width <= tile_size and height <= tile_size):
+        render_maze_image(grid, cell_width).save_image(filename)
+        return [filename]
+
+    strips, edges = edge_strips(grid, cell_width, tile_size)
+    stem, extension = os.path.splitext(filename)
+    written = []
+    for row, top in enumerate(range(0, height, tile_size)):
+        tile_height = min(tile_size, height - top)
+        # Each row of tiles only builds the rectangles of the edges that reach into it
+        row_rectangles, row_colors = maze_rectangles(grid, cell_width, edges=strip_slice(strips, edges, row))
+        for column, left in enumerate(range(0, width, tile_size)):
+            tile = RasterImage(min(tile_size, width - left), tile_height)
+            tile.fill_rectangles(row_rectangles, row_colors, left, top)
+            tile_file = f"{stem}_r{row}_c{column}{extension or '.png'}"
+            tile.to_image().save_image(tile_file)
+            written.append(tile_file)
+    print(f"Wrote {len(written)} tiles of up to {tile_size}px for a {width}x{height} image")
+    return written
+
+def export_maze_png_streaming(grid, filename, pixels_per_cell=None, max_dimension=None, mode="palette",
+                              strip_height=STRIP_HEIGHT):
+    """
+    Writes the maze as one PNG of any size by rendering horizontal strips and streaming them
+    through PNGStreamWriter. Peak memory is one strip, its rectangles and the edge_strips index,
+    whatever the image area.
+
+    :param grid: MazeGrid with the carved edges
+    :param filename: Path of the PNG
+    :param pixels_per_cell, max_dimension: See cell_size_for
+    :param mode: "rgb", "palette" (4-bit, smallest with colour) or "1bit" (black and white only)
+    :param strip_height: Rows rendered per strip
+    :return: filename
+    """
+    cell_width = cell_size_for(grid, pixels_per_cell, max_dimension)
+    width, height = grid.width * cell_width, grid.height * cell_width
+    strips, edges = edge_strips(grid, cell_width, strip_height)
+
+    with open(filename, "wb") as f:
+        writer = PNGStreamWriter(f, width, height, list(PALETTE.values()), mode)
+        for number, top in enumerate(range(0, height, strip_height)):
+            strip = RasterImage(width, min(strip_height, height - top))
+            rectangles, colors = maze_rectangles(grid, cell_width, edges=strip_slice(strips, edges, number))
+            strip.fill_rectangles(rectangles, colors, 0, top)
+            writer.write_rows(strip.pixels)
+        writer.close()
+    return filename
+
+def render_graph_image(graph, cell_width, offset_x=0, offset_y=0, image_width=None, image_height=None):
+    """
+    Draws a maze read from a file (a MazeGraph) onto a new MazeImage in one pass:
+    every corridor in file order with its own colour, then the markers on top.
+    Gives the same pixels as quick_rectangle drawing the corridors one by one.
+
+    :param graph: MazeGraph from read_maze_csv or read_maze_binary
+    :param cell_width: Size of a cell in pixels
+    :return: MazeImage
+    """
+    width = image_width or graph.width * cell_width + 2 * offset_x
+    height = image_height or graph.height * cell_width + 2 * offset_y
+    markers = [(graph.start_node, "green"), (graph.end_node, "red")]
+
+    if np is None or not set(graph.colors) <= COLOR_INDEX.keys():
+        # Colours outside the palette can only be drawn by PIL
+        image = MazeImage(width, height)
+        corridor_width = cell_width // 2
+        for node1, node2, color in graph.corridors():
+            draw_corridor(image.draw_rectangle, Node(*node1), Node(*node2), corridor_width,
+                          cell_width, offset_x, offset_y, color=color)
+        for node, color in markers:
+            if node is not None:
+                draw_marker(image.draw_rectangle, Node(*node), corridor_width, cell_width, offset_x, offset_y, color)
+        return image
+
+    colors = None
+    if any(color != "white" for color in graph.colors):
+        colors = np.array([COLOR_INDEX[color] for color in graph.colors], dtype=np.uint8)
+    corridors = corridor_rectangles(np.frombuffer(graph.corridor_x1, dtype=np.int32),
+                                    np.frombuffer(graph.corridor_y1, dtype=np.int32),
+                                    np.frombuffer(graph.corridor_x2, dtype=np.int32),
+                                    np.frombuffer(graph.corridor_y2, dtype=np.int32),
+                                    cell_width, offset_x, offset_y, colors)
+    raster = RasterImage(width, height)
+    raster.fill_rectangles(*_join(corridors, marker_rectangles(markers, cell_width, offset_x, offset_y)))
+    return raster.to_image()
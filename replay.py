@@ -0,0 +1,142 @@
+#This file animates a StepLog on the canvas, so watching a maze being built no longer means building it live.
+#The player runs from after() callbacks like the solver animation: Tk stays responsive,
+#and it can be paused, sped up, or sent to any step with seek() (the UI's scrub bar does that).
+#It can also follow a log that is still growing while a background generation streams steps in.
+
+from node import Node
+from render import draw_corridor, draw_marker
+from steplog import CARVE
+
+REPLAY_TAG = "replay"
+
+class ReplayPlayer:
+    FRAME_MS = 16  # ~60 fps
+    MAX_STEPS_PER_FRAME = 400  # At 100% speed; scaled down by (speed/100)^2
+
+    def __init__(self, maze, log, on_position=None):
+        """
+        Args:
+            maze (MazeAlgorithm): Gives the canvas, master, cell size, offsets, endpoints and speed slider.
+            log (StepLog): The steps to play back.
+            on_position (callable, optional): Called with the new position whenever it changes.
+        """
+        self.maze = maze
+        self.log = log
+        self.canvas = maze.canvas
+        self.master = maze.master
+        self.on_position = on_position
+
+        self.position = 0  # Number of events drawn so far
+        self.playing = False
+        self._after_id = None
+        self._head = None
+
+    def _node(self, cell):
+        y, x = divmod(cell, self.log.width)
+        return Node(x, y)
+
+    def _grid2Coord(self, cell):
+        y, x = divmod(cell, self.log.width)
+        maze = self.maze
+        return (x * maze.cell_width + maze.cell_width / 2 + maze.offset_x,
+                y * maze.cell_width + maze.cell_width / 2 + maze.offset_y)
+
+    def _create_rectangle(self, *coords, **options):
+        return self.canvas.create_rectangle(*coords, tags=REPLAY_TAG, **options)
+
+    @property
+    def finished(self):
+        return self.position >= len(self.log) and self.log.complete
+
+    def play(self):
+        if self.position >= len(self.log):
+            self.seek(0)
+        self.playing = True
+        if self._after_id is None:
+            self._after_id = self.master.after(0, self._frame)
+
+    def pause(self):
+        self.playing = False
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def stop(self):
+        # Leaves whatever has been drawn; the UI clears the canvas itself
+        self.pause()
+
+    def seek(self, position):
+        """
+        Jumps to a step. Going forward draws the steps in between in one batch;
+        going back clears the replay's items and redraws up to the new position.
+
+        Args:
+            position (int): Number of events that should be drawn.
+        """
+        position = max(0, min(int(position), len(self.log)))
+        if position < self.position:
+            self.canvas.delete(REPLAY_TAG)
+            self._head = None
+            self.position = 0
+        self._draw_events(self.position, position)
+        self.position = position
+        self._draw_head()
+        if self.on_position is not None:
+            self.on_position(position)
+
+    def _draw_events(self, begin, end):
+        maze = self.maze
+        width = maze.cell_width // 2
+        log = self.log
+        for index in range(begin, end):
+            prev_cell, cell, kind = log[index]
+            if kind == CARVE:
+                draw_corridor(self._create_rectangle, self._node(prev_cell), self._node(cell), width,
+                              maze.cell_width, maze.offset_x, maze.offset_y)
+        if end > begin:
+            self._draw_markers(width)
+
+    def _draw_markers(self, width):
+        # Markers are redrawn on top of each batch instead of after every corridor
+        self.canvas.delete("replay_marker")
+        maze = self.maze
+        for node, color in ((maze.start_node, "green"), (maze.end_node, "red")):
+            if node is not None:
+                draw_marker(lambda *coords, **options: self.canvas.create_rectangle(
+                                *coords, tags=(REPLAY_TAG, "replay_marker"), **options),
+                            node, width, maze.cell_width, maze.offset_x, maze.offset_y, color)
+
+    def _draw_head(self):
+        # A small blue square follows the DFS, so backtracking is visible too
+        if self.position == 0 or (self.position >= len(self.log) and self.log.complete):
+            if self._head is not None:
+                self.canvas.delete(self._head)
+                self._head = None
+            return
+        x, y = self._grid2Coord(self.log.cells[self.position - 1])
+        radius = max(self.maze.cell_width // 6, 1)
+        if self._head is None:
+            self._head = self._create_rectangle(x - radius, y - radius, x + radius, y + radius,
+                                                fill="blue", outline="")
+        else:
+            self.canvas.coords(self._head, x - radius, y - radius, x + radius, y + radius)
+            self.canvas.tag_raise(self._head)
+
+    def _frame(self):
+        self._after_id = None
+        if not self.playing:
+            return
+        speed = self.maze.speed_var.get() / 100
+        steps = max(1, round(self.MAX_STEPS_PER_FRAME * speed * speed))
+        self.seek(self.position + steps)
+        if self.position >= len(self.log) and self.log.complete:
+            self.playing = False
+            return
+        # A log that is still streaming in just keeps the player waiting for more steps
+        self._after_id = self.master.after(self.FRAME_MS, self._frame)
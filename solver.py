@@ -1,110 +1,165 @@
 #Claude generated the base of this file, but Owen and Max periodically edited and added code within it.
+#The UI plumbing the BFS and DFS solvers used to duplicate now lives in MazeSolver; each solver only writes search().
 #Additional notes can be found below.
 
-from collections import deque, defaultdict
-import tkinter.messagebox as messagebox
-class DepthFirstSolver:
-    def __init__(self, ui, csv_file, image):
+import heapq
+import time
+from array import array
+from collections import deque
+from graph import read_maze_csv
+from profiling import profiler
+from worker import BackgroundJob
+
+def rebuild_path(graph, parent, goal):
+    # Walks the parent pointers back from the goal; the start cell is its own parent
+    path = [goal]
+    while parent[path[-1]] != path[-1]:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+class MazeSolver:
+    name = "Solver"
+
+    def __init__(self, ui, csv_file, image, graph=None):
+        """
+        Args:
+            ui: The MazeGeneratorUI to draw on, or None to only search (no canvas needed).
+            csv_file (str): Path to the exported maze.
+            image (MazeImage): Image that gets the solution drawn on it for PNG export.
+            graph (MazeGraph, optional): Already parsed maze, so the file isn't read twice.
+        """
         self.image = image
-        self.canvas = ui.canvas
-        self.master = ui.master
-        self.nodes = []
-        self.graph = defaultdict(list)
+        self.ui = ui
+        self.canvas = ui.canvas if ui else None
+        self.master = ui.master if ui else None
+        self.graph = None
         self.start_node = None
         self.end_node = None
 
-        # UI configuration
-        self.cell_width = ui.current_maze_algorithm.cell_width
-        self.offset_x = ui.current_maze_algorithm.offset_x
-        self.offset_y = ui.current_maze_algorithm.offset_y
-
-        # Read the maze graph from CSV
-        self._parse_csv(csv_file)
-
-    def _parse_csv(self, csv_file): #ChatGPT wrote this method, but Owen made many adjustments
-        # Reset data structures
-        self.nodes = []
-        self.graph = defaultdict(list)
-        self.start_node = None
-        self.end_node = None
+        # Search statistics from the last solve()
+        self.nodes_expanded = 0
+        self.elapsed = 0.0
+        self.recorded = False  # Whether elapsed includes recording the explored cells
 
-        with open(csv_file, 'r') as f:
-            # Read entire file content
-            content = f.readlines()
+        # Animation state for solve_with_visualization
+        self.steps = []
+        self.step_index = 0
+        self._after_id = None
+        self.job = None  # Background search, while it runs
+        self.skip_requested = False  # Skip was pressed before the search finished
 
-        # Find the start of nodes and edges sections
-        nodes_start = content.index("# Nodes\n") + 2  # Skip header
-        edges_start = content.index("# Edges (Adjacency List)\n") + 2  # Skip header
+        # UI configuration
+        if ui:
+            self.cell_width = ui.current_maze_algorithm.cell_width
+            self.offset_x = ui.current_maze_algorithm.offset_x
+            self.offset_y = ui.current_maze_algorithm.offset_y
+
+        # Read the maze graph from CSV, unless the caller already parsed it
+        if graph is None:
+            self._parse_csv(csv_file)
+        else:
+            self.graph = graph
+            self.start_node, self.end_node = graph.start_node, graph.end_node
+
+    def _parse_csv(self, csv_file): #All the solvers and the importer share graph.read_maze_csv
+        self.graph = read_maze_csv(csv_file)
+        self.start_node = self.graph.start_node
+        self.end_node = self.graph.end_node
+
+    def search(self, start, goal, on_explore):
+        """
+        Finds a path between two cells. Subclasses add one to self.nodes_expanded per node they expand.
 
-        # Parse Nodes
-        for line in content[nodes_start:edges_start - 2]:
-            row = line.strip().split(',')
-            if len(row) < 4:
-                continue
+        Args:
+            start (int): Start cell index.
+            goal (int): End cell index.
+            on_explore (callable or None): Called with (cell, neighbor) for every newly discovered cell.
 
-            try:
-                x = int(row[0])
-                y = int(row[1])
-                x2,y2 = int(row[4]),int(row[5])
-                is_start = row[2].lower() == 'true'
-                is_end = row[7].lower() == 'true'
-
-                # Mark start and end nodes
-                if is_start:
-                    node = (x,y)
-                    self.start_node = node
-                    print(f"Found start node: {self.start_node}")
-                    self.nodes.append(node)
-                if is_end:
-                    node = (x2,y2)
-                    self.end_node = node
-                    print(f"Found end node: {self.end_node}")
-                    self.nodes.append(node)
-                if not is_start and not is_end:
-                    node = (x, y)
-                    self.nodes.append(node)
-
-
-            except (ValueError, IndexError) as e:
-                print(f"Error parsing node row {row}: {e}")
-                continue
+        Returns:
+            list: Cell indices from start to goal, or None if no path exists
+        """
+        raise NotImplementedError
 
-        # Parse Edges
-        for line in content[edges_start:]:
-            row = line.strip().split(',')
+    def solve(self, on_explore=None):
+        """
+        Runs the search without drawing anything, timing it and counting expanded nodes.
 
-            # Ensure the row has exactly 4 values (source_x, source_y, neighbor_x, neighbor_y)
-            if len(row) != 4:
-                print(f"Skipping invalid edge row: {row}")
-                continue
+        Args:
+            on_explore (callable, optional): Called with (node, neighbor) for every newly discovered node.
 
-            try:
-                # Parse source and neighbor coordinates
-                source_x, source_y, neighbor_x, neighbor_y = map(int, row)
-                source = (source_x, source_y)
-                neighbor = (neighbor_x, neighbor_y)
+        Returns:
+            list: Path from start to end node, or None if no path exists
+        """
+        graph = self.graph
+        self.nodes_expanded = 0
+        self.elapsed = 0.0
+        if self.start_node is None or self.end_node is None:
+            return None
+        if self.start_node not in graph or self.end_node not in graph:
+            return None
 
-                # Add bidirectional connections
-                self.graph[source].append(neighbor)
-                self.graph[neighbor].append(source)
+        explore = None
+        if on_explore is not None:
+            explore = lambda cell, neighbor: on_explore(graph.node(cell), graph.node(neighbor))
 
-            except ValueError as e:
-                print(f"Error parsing edge row {row}: {e}")
-                continue
+        began = time.perf_counter()
+        path = self.search(graph.cell(self.start_node), graph.cell(self.end_node), explore)
+        self.elapsed = time.perf_counter() - began
+        self.recorded = on_explore is not None
+        return None if path is None else [graph.node(cell) for cell in path]
 
-        # Detailed debugging information
-        print(f"Total nodes: {len(self.nodes)}")
-        print(f"Total graph connections: {len(self.graph)}")
-        print("Graph connections:")
-        for node, neighbors in self.graph.items():
-            print(f"{node}: {neighbors}")
-    def solve_with_visualization(self):
+    def solve_recorded(self):
         """
-        Solve the maze using Breadth-First Search with step-by-step visualization
+        Runs the search once and also records every discovery, for the animation.
+        While the clock runs only raw cell indices are appended to two arrays; they become nodes
+        after it stops, so self.elapsed is the search plus two appends per discovered cell.
 
         Returns:
-            list: Path from start to end node, or None if no path exists
+            tuple: (path or None, list of (node, neighbor) pairs in discovery order)
+        """
+        sources, targets = array('i'), array('i')
+        add_source, add_target = sources.append, targets.append
+
+        def record(cell, neighbor):
+            add_source(cell)
+            add_target(neighbor)
+
+        graph = self.graph
+        self.nodes_expanded = 0
+        self.elapsed = 0.0
+        self.recorded = True
+        if self.start_node is None or self.end_node is None:
+            return None, []
+        if self.start_node not in graph or self.end_node not in graph:
+            return None, []
+
+        began = time.perf_counter()
+        path = self.search(graph.cell(self.start_node), graph.cell(self.end_node), record)
+        self.elapsed = time.perf_counter() - began
+
+        node = graph.node
+        explored = [(node(cell), node(neighbor)) for cell, neighbor in zip(sources, targets)]
+        return None if path is None else [node(cell) for cell in path], explored
+
+    def report(self):
+        # Says whether the time includes recording the steps, so it isn't compared with bare solve() times
+        timing = "search + step recording" if self.recorded else "search"
+        return f"{self.name}: {self.nodes_expanded} nodes expanded in {self.elapsed * 1000:.1f} ms ({timing})"
+
+    def solve_with_visualization(self, on_done=None):
+        """
+        Solve the maze on a worker thread, then animate the exploration and the path without blocking Tk.
+        The search runs to the end first; the canvas catches up in after() callbacks,
+        drawing as many steps per frame as the speed slider and the frame budget allow.
+
+        Args:
+            on_done (callable, optional): Called from the Tk main loop with the path
+                (list of nodes, or None if there is none) once the search has finished.
         """
+        # Tk is only needed once there is a window; batch jobs and benchmarks import this module without it
+        import tkinter.messagebox as messagebox
+
         # Extensive validation and debugging
         if not self.start_node:
             print("ERROR: No start node found!")
@@ -128,291 +183,295 @@ class DepthFirstSolver:
 
         print(f"Solving from {self.start_node} to {self.end_node}")
         print(f"Start node neighbors: {self.graph[self.start_node]}")
-        # DFS queue and visited set
-        stack = deque()
-        stack.append((self.start_node, [self.start_node]))
-
-        # Set to track visited nodes
-        visited = set()
-        visited.add(self.start_node)  # Mark the start node as visited
-
-        def grid2Coord(node):
-            """Convert grid coordinates to canvas coordinates"""
-            x, y = node
-            return (x * self.cell_width + self.cell_width / 2 + self.offset_x,
-                    y * self.cell_width + self.cell_width / 2 + self.offset_y)
-
-        def draw_line(node1, node2, color):
-            """
-            Draw a line on the canvas between two nodes with the given color.
-
-            Args:
-                node1 (tuple): Coordinates of the first node (x1, y1).
-                node2 (tuple): Coordinates of the second node (x2, y2).
-                color (str): Color of the line to draw.
-            """
-            x1, y1 = grid2Coord(node1)
-            x2, y2 = grid2Coord(node2)
-
-            self.canvas.create_line(
-                x1, y1, x2, y2,
-                fill=color,
-                width=self.cell_width//18,
-                tags="solution"
-            )
-            radius = self.cell_width // 12
-            self.canvas.create_oval(
-                x2 - radius, y2 - radius,
-                x2 + radius, y2 + radius,
-                fill=color, outline="", tags="solution"
-            )
-            #For export PNG image
-            self.image.draw_line(x1, y1, x2, y2, fill=color, width=5)
-            self.image.draw_ellipse(x2 - radius, y2 - radius,
-                                    x2 + radius, y2 + radius,
-                                    fill=color, outline="")
-            self.master.update()
-            self.master.after(50)  # Small delay for visualization
+
+        def work(job):
+            # Worker thread: one search that records what to animate; turning the cells into
+            # steps happens after its clock stops, with a cancellation check between the two
+            path, explored = self.solve_recorded()
+            job.check_cancelled()
+            return path, [(node, neighbor, "purple") for node, neighbor in explored]
+
+        self.ui.current_solver = self
+        self.job = BackgroundJob(self.master, work,
+                                 on_done=lambda result: self._show_result(*result, on_done)).start()
+
+    def _show_result(self, path, explored, on_done=None):
+        # Back on the Tk thread with the finished search
+        self.job = None
+        print(self.report())
+        profiler.report_run(f"{self.__class__.__name__} solve")
+
+        self.steps = explored
+        if path is not None:
+            # The final path goes on top in blue
+            self.steps += [(path[i], path[i + 1], "blue") for i in range(len(path) - 1)]
+
+        # The export image doesn't need animating, so it gets everything right away
+        for node1, node2, color in self.steps:
+            self._draw_on_image(node1, node2, color)
+
+        self.step_index = 0
+        if self.skip_requested:
+            self.skip_to_result()
+        else:
+            self._after_id = self.master.after(0, self._animate_frame)
+
+        if path is not None:
+            print(f"Path found: {len(path)} nodes from {path[0]} to {path[-1]}")
+        else:
+            # No path found
+            import tkinter.messagebox as messagebox
+            print("No path found!")
+            messagebox.showinfo("Solve Result", "No path found between start and end nodes!")
+
+        if on_done is not None:
+            on_done(path)
+
+    FRAME_MS = 16               # Time between animation frames
+    FRAME_BUDGET = 0.012        # Seconds of drawing allowed in one frame
+    MAX_STEPS_PER_FRAME = 400   # Steps per frame with the speed slider at 100%
+
+    def _animate_frame(self):
+        speed = self.ui.speed_var.get() / 100
+        steps_this_frame = max(1, round(speed * speed * self.MAX_STEPS_PER_FRAME))
+        began = time.perf_counter()
+
+        drawn = 0
+        while (self.step_index < len(self.steps) and drawn < steps_this_frame
+               and time.perf_counter() - began < self.FRAME_BUDGET):
+            self._draw_on_canvas(*self.steps[self.step_index])
+            self.step_index += 1
+            drawn += 1
+
+        if self.step_index < len(self.steps):
+            self._after_id = self.master.after(self.FRAME_MS, self._animate_frame)
+        else:
+            self._after_id = None
+
+    @property
+    def animating(self):
+        # Still searching, or steps left to draw on the canvas
+        return self.job is not None or self.step_index < len(self.steps)
+
+    def skip_to_result(self):
+        """Draws every remaining step at once; Tk repaints once when control returns to it."""
+        if self.job is not None:
+            # Still searching: _show_result draws everything as soon as the search is done
+            self.skip_requested = True
+            return
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+        for node1, node2, color in self.steps[self.step_index:]:
+            self._draw_on_canvas(node1, node2, color)
+        self.step_index = len(self.steps)
+
+    def stop(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _grid2Coord(self, node):
+        """Convert grid coordinates to canvas coordinates"""
+        x, y = node
+        return (x * self.cell_width + self.cell_width / 2 + self.offset_x,
+                y * self.cell_width + self.cell_width / 2 + self.offset_y)
+
+    def _draw_on_canvas(self, node1, node2, color):
+        """
+        Draw a line on the canvas between two nodes with the given color.
+
+        Args:
+            node1 (tuple): Coordinates of the first node (x1, y1).
+            node2 (tuple): Coordinates of the second node (x2, y2).
+            color (str): Color of the line to draw.
+        """
+        x1, y1 = self._grid2Coord(node1)
+        x2, y2 = self._grid2Coord(node2)
+
+        self.canvas.create_line(
+            x1, y1, x2, y2,
+            fill=color,
+            width=self.cell_width//18,
+            tags="solution"
+        )
+        radius = self.cell_width // 12
+
+        self.canvas.create_oval(
+            x2 - radius, y2 - radius,
+            x2 + radius, y2 + radius,
+            fill=color, outline="", tags="solution"
+        )
+
+    def _draw_on_image(self, node1, node2, color):
+        #For export PNG image
+        x1, y1 = self._grid2Coord(node1)
+        x2, y2 = self._grid2Coord(node2)
+        radius = self.cell_width // 12
+        self.image.draw_line(x1, y1, x2, y2, fill=color, width=5)
+        self.image.draw_ellipse(x2 - radius, y2 - radius,
+                                x2 + radius, y2 + radius,
+                                fill=color, outline="")
+
+
+class DepthFirstSolver(MazeSolver):
+    name = "DFS"
+
+    def search(self, start, goal, on_explore): #Parent pointers replaced the per-node path copies
+        graph = self.graph
+        parent = array('i', [-1]) * (graph.width * graph.height)
+        parent[start] = start  # Mark the start node as visited
+        stack = deque([start])
 
         while stack:
-            # Dequeue the first element
-            current_node, path = stack.pop()
+            current = stack.pop()
+            self.nodes_expanded += 1
 
             # Check if we've reached the end node
-            if current_node == self.end_node:
-                print(f"Path found: {path}")
-
-                # Visualize the final path with yellow lines
-                for i in range(len(path) - 1):
-                    draw_line(path[i], path[i + 1], color="blue")
-                return path
+            if current == goal:
+                return rebuild_path(graph, parent, goal)
 
             # Explore neighbors
-            for neighbor in self.graph[current_node]:
-                if neighbor not in visited:
-                    # Mark the neighbor as visited
-                    visited.add(neighbor)
+            for neighbor in graph.neighbor_cells(current):
+                if parent[neighbor] == -1:
+                    parent[neighbor] = current
+                    if on_explore is not None:
+                        on_explore(current, neighbor)
+                    stack.append(neighbor)
 
-                    # Visualize the exploration with purple lines
-                    draw_line(current_node, neighbor, color="purple")
-
-                    # Add the neighbor and updated path to the stack
-                    stack.append((neighbor, path + [neighbor]))
-
-            print(f"Explored node: {current_node}, Path so far: {path}")
-
-        # No path found
-        print("No path found!")
-        messagebox.showinfo("Solve Result", "No path found between start and end nodes!")
         return None
 
 
-class BreadthFirstSolver:
-    def __init__(self, ui, csv_file, image):
-        self.image = image
-        self.canvas = ui.canvas
-        self.master = ui.master
-        self.nodes = []
-        self.graph = defaultdict(list)
-        self.start_node = None
-        self.end_node = None
-
-        # UI configuration
-        self.cell_width = ui.current_maze_algorithm.cell_width
-        self.offset_x = ui.current_maze_algorithm.offset_x
-        self.offset_y = ui.current_maze_algorithm.offset_y
-
-        # Read the maze graph from CSV
-        self._parse_csv(csv_file)
+class BreadthFirstSolver(MazeSolver):
+    name = "BFS"
 
-    def _parse_csv(self, csv_file): #ChatGPT wrote this method, but Owen made many adjustments for correctness.
-        """
-        Parse the CSV file to create nodes and graph structure
+    def search(self, start, goal, on_explore): #Parent pointers replaced the per-node path copies
+        graph = self.graph
+        parent = array('i', [-1]) * (graph.width * graph.height)
+        parent[start] = start  # Mark the start node as visited
+        queue = deque([start])
 
-        Args:
-            csv_file (str): Path to the CSV file
-        """
-        # Reset data structures
-        self.nodes = []
-        self.graph = defaultdict(list)
-        self.start_node = None
-        self.end_node = None
+        while queue:
+            current = queue.popleft()
+            self.nodes_expanded += 1
 
-        with open(csv_file, 'r') as f:
-            # Read entire file content
-            content = f.readlines()
+            # Check if we've reached the end node
+            if current == goal:
+                return rebuild_path(graph, parent, goal)
 
-        # Find the start of nodes and edges sections
-        nodes_start = content.index("# Nodes\n") + 2  # Skip header
-        edges_start = content.index("# Edges (Adjacency List)\n") + 2  # Skip header
+            # Explore neighbors
+            for neighbor in graph.neighbor_cells(current):
+                if parent[neighbor] == -1:
+                    parent[neighbor] = current
+                    if on_explore is not None:
+                        on_explore(current, neighbor)
+                    queue.append(neighbor)
 
-        # Parse Nodes
-        for line in content[nodes_start:edges_start - 2]:
-            row = line.strip().split(',')
-            if len(row) < 4:
-                continue
+        return None
 
-            try:
-                x = int(row[0])
-                y = int(row[1])
-                x2,y2 = int(row[4]),int(row[5])
-                is_start = row[2].lower() == 'true'
-                is_end = row[7].lower() == 'true'
-
-                # Mark start and end nodes
-                if is_start:
-                    node = (x,y)
-                    self.start_node = node
-                    print(f"Found start node: {self.start_node}")
-                    self.nodes.append(node)
-                if is_end:
-                    node = (x2,y2)
-                    self.end_node = node
-                    print(f"Found end node: {self.end_node}")
-                    self.nodes.append(node)
-                if not is_start and not is_end:
-                    node = (x, y)
-                    self.nodes.append(node)
-
-
-            except (ValueError, IndexError) as e:
-                print(f"Error parsing node row {row}: {e}")
-                continue
 
-        # Parse Edges
-        for line in content[edges_start:]:
-            row = line.strip().split(',')
+class AStarSolver(MazeSolver):
+    name = "A*"
 
-            # Ensure the row has exactly 4 values (source_x, source_y, neighbor_x, neighbor_y)
-            if len(row) != 4:
-                print(f"Skipping invalid edge row: {row}")
+    def search(self, start, goal, on_explore):
+        """
+        A* where a corridor costs its length, with Manhattan distance to the end as the heuristic.
+        Long straight jumps (high reach) let it head for the end instead of flooding the maze.
+        """
+        graph = self.graph
+        width = graph.width
+        goal_y, goal_x = divmod(goal, width)
+
+        def heuristic(cell):
+            y, x = divmod(cell, width)
+            return abs(x - goal_x) + abs(y - goal_y)
+
+        parent = array('i', [-1]) * (graph.width * graph.height)
+        closed = bytearray(graph.width * graph.height)
+        cost = {start: 0}
+        parent[start] = start
+
+        # Ties break on insertion order so the search is deterministic
+        counter = 0
+        frontier = [(heuristic(start), counter, start)]
+
+        while frontier:
+            _, _, current = heapq.heappop(frontier)
+            if closed[current]:
                 continue
+            closed[current] = 1
+            self.nodes_expanded += 1
+
+            if current == goal:
+                return rebuild_path(graph, parent, goal)
+
+            current_y, current_x = divmod(current, width)
+            for neighbor in graph.neighbor_cells(current):
+                if closed[neighbor]:
+                    continue
+                neighbor_y, neighbor_x = divmod(neighbor, width)
+                new_cost = cost[current] + abs(neighbor_x - current_x) + abs(neighbor_y - current_y)
+                if neighbor not in cost or new_cost < cost[neighbor]:
+                    if neighbor not in cost and on_explore is not None:
+                        on_explore(current, neighbor)
+                    cost[neighbor] = new_cost
+                    parent[neighbor] = current
+                    counter += 1
+                    heapq.heappush(frontier, (new_cost + heuristic(neighbor), counter, neighbor))
 
-            try:
-                # Parse source and neighbor coordinates
-                source_x, source_y, neighbor_x, neighbor_y = map(int, row)
-                source = (source_x, source_y)
-                neighbor = (neighbor_x, neighbor_y)
+        return None
 
-                # Add bidirectional connections
-                self.graph[source].append(neighbor)
-                self.graph[neighbor].append(source)
 
-            except ValueError as e:
-                print(f"Error parsing edge row {row}: {e}")
-                continue
+class BidirectionalSolver(MazeSolver):
+    name = "Bidirectional BFS"
 
-        # Detailed debugging information
-        print(f"Total nodes: {len(self.nodes)}")
-        print(f"Total graph connections: {len(self.graph)}")
-        print("Graph connections:")
-        for node, neighbors in self.graph.items():
-            print(f"{node}: {neighbors}")
-    def solve_with_visualization(self):
+    def search(self, start, goal, on_explore):
         """
-        Solve the maze using Breadth-First Search with step-by-step visualization
-
-        Returns:
-            list: Path from start to end node, or None if no path exists
+        Runs a BFS from each end at once, always growing the smaller frontier by a full level,
+        and stops as soon as the two searches touch.
         """
-        # Extensive validation and debugging
-        if not self.start_node:
-            print("ERROR: No start node found!")
-            messagebox.showerror("Solve Error", "No start node found in the maze!")
-            return None
-
-        if not self.end_node:
-            print("ERROR: No end node found!")
-            messagebox.showerror("Solve Error", "No end node found in the maze!")
-            return None
-
-        if self.start_node not in self.graph:
-            print(f"ERROR: Start node {self.start_node} not in graph!")
-            messagebox.showerror("Solve Error", f"Start node {self.start_node} not connected to any nodes!")
-            return None
-
-        if self.end_node not in self.graph:
-            print(f"ERROR: End node {self.end_node} not in graph!")
-            messagebox.showerror("Solve Error", f"End node {self.end_node} not connected to any nodes!")
-            return None
-
-        print(f"Solving from {self.start_node} to {self.end_node}")
-        print(f"Start node neighbors: {self.graph[self.start_node]}")
-        # BFS queue and visited set
-        queue = deque()
-        queue.append((self.start_node, [self.start_node]))
-
-        # Set to track visited nodes
-        visited = set()
-        visited.add(self.start_node)  # Mark the start node as visited
-
-        def grid2Coord(node):
-            """Convert grid coordinates to canvas coordinates"""
-            x, y = node
-            return (x * self.cell_width + self.cell_width / 2 + self.offset_x,
-                    y * self.cell_width + self.cell_width / 2 + self.offset_y)
-
-        def draw_line(node1, node2, color):
-            """
-            Draw a line on the canvas between two nodes with the given color.
-
-            Args:
-                node1 (tuple): Coordinates of the first node (x1, y1).
-                node2 (tuple): Coordinates of the second node (x2, y2).
-                color (str): Color of the line to draw.
-            """
-            x1, y1 = grid2Coord(node1)
-            x2, y2 = grid2Coord(node2)
-
-            self.canvas.create_line(
-                x1, y1, x2, y2,
-                fill=color,
-                width=self.cell_width//18,
-                tags="solution"
-            )
-            radius = self.cell_width // 12
-
-            self.canvas.create_oval(
-                x2 - radius, y2 - radius,
-                x2 + radius, y2 + radius,
-                fill=color, outline="", tags="solution"
-            )
-            #For export PNG image
-            self.image.draw_line(x1, y1, x2, y2, fill=color, width=5)
-            self.image.draw_ellipse(x2 - radius, y2 - radius,
-                                    x2 + radius, y2 + radius,
-                                    fill=color, outline="")
-            self.master.update()
-            self.master.after(50)  # Small delay for visualization
-
-        while queue:
-            # Dequeue the first element
-            current_node, path = queue.popleft()
-
-            # Check if we've reached the end node
-            if current_node == self.end_node:
-                print(f"Path found: {path}")
+        if start == goal:
+            return [start]
+
+        graph = self.graph
+        size = graph.width * graph.height
+        parents = (array('i', [-1]) * size, array('i', [-1]) * size)
+        parents[0][start] = start
+        parents[1][goal] = goal
+        frontiers = [[start], [goal]]
+
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            parent, other = parents[side], parents[1 - side]
+            next_frontier = []
+
+            for current in frontiers[side]:
+                self.nodes_expanded += 1
+                for neighbor in graph.neighbor_cells(current):
+                    if parent[neighbor] != -1:
+                        continue
+                    parent[neighbor] = current
+                    if on_explore is not None:
+                        on_explore(current, neighbor)
+                    if other[neighbor] != -1:
+                        # The two searches met: join start..neighbor with neighbor..goal
+                        forward = rebuild_path(graph, parents[0], neighbor)
+                        backward = rebuild_path(graph, parents[1], neighbor)
+                        return forward + backward[-2::-1]
+                    next_frontier.append(neighbor)
+
+            frontiers[side] = next_frontier
 
-                # Visualize the final path with yellow lines
-                for i in range(len(path) - 1):
-                    draw_line(path[i], path[i + 1], color="blue")
-                return path
-
-            # Explore neighbors
-            for neighbor in self.graph[current_node]:
-                if neighbor not in visited:
-                    # Mark the neighbor as visited
-                    visited.add(neighbor)
-
-                    # Visualize the exploration with purple lines
-                    draw_line(current_node, neighbor, color="purple")
-
-                    # Add the neighbor and updated path to the queue
-                    queue.append((neighbor, path + [neighbor]))
+        return None
 
-            print(f"Explored node: {current_node}, Path so far: {path}")
 
-        # No path found
-        print("No path found!")
-        messagebox.showinfo("Solve Result", "No path found between start and end nodes!")
-        return None
+# Solvers offered in the UI's Solve dropdown, keyed by the name import_maze_from_csv is given
+SOLVERS = {
+    "bfs": BreadthFirstSolver,
+    "dfs": DepthFirstSolver,
+    "astar": AStarSolver,
+    "bidirectional": BidirectionalSolver,
+}
@@ -0,0 +1,122 @@
+#This file records how a maze was carved so it can be animated later without generating it again.
+#A StepLog is just three parallel arrays (previous cell, current cell, kind) plus the maze's size, endpoints and seed.
+#It has no Tk imports; replay.py does the animating.
+
+import os
+import struct
+import sys
+from array import array
+from grid import MazeGrid
+
+CARVE = 0
+BACKTRACK = 1
+
+# Step log file (.steps), little-endian: header, then event count int32 previous cells,
+# event count int32 current cells and event count kind bytes
+STEP_LOG_MAGIC = b"SLOG"
+STEP_LOG_VERSION = 1
+STEP_LOG_HEADER = struct.Struct("<4sHHIIiiqI")  # magic, version, flags, width, height, start, end, seed, event count
+FLAG_HAS_SEED = 1
+
+class StepLog:
+    def __init__(self, width, height, start=-1, end=-1, seed=None):
+        """
+        An empty log for a maze of the given size.
+
+        :param start, end: Start and end cells (-1 if unknown)
+        :param seed: Seed the maze was generated from
+        """
+        self.width, self.height = width, height
+        self.start, self.end = start, end
+        self.seed = seed
+        self.prev_cells = array('i')
+        self.cells = array('i')
+        self.kinds = bytearray()
+        self.complete = True  # False while events are still streaming in from a background generation
+
+    @classmethod
+    def record(cls, generator):
+        """
+        Generates a maze headlessly and logs every step of it.
+
+        :param generator: A fresh MazeGenerator
+        :return: StepLog (the generator holds the finished maze as usual)
+        """
+        log = cls(generator.grid.width, generator.grid.height, seed=generator.seed)
+        prev_cells, cells, kinds = log.prev_cells, log.cells, log.kinds
+
+        def on_carve(prev_cell, cell):
+            prev_cells.append(prev_cell)
+            cells.append(cell)
+            kinds.append(CARVE)
+
+        def on_backtrack(prev_cell, cell):
+            prev_cells.append(prev_cell)
+            cells.append(cell)
+            kinds.append(BACKTRACK)
+
+        generator.generate(on_carve, on_backtrack)
+        log.start, log.end = generator.grid.start, generator.grid.end
+        return log
+
+    def add(self, kind, prev_cell, cell):
+        self.prev_cells.append(prev_cell)
+        self.cells.append(cell)
+        self.kinds.append(kind)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        return self.prev_cells[index], self.cells[index], self.kinds[index]
+
+    def to_grid(self):
+        """Rebuilds the finished maze (a MazeGrid) from the carve events."""
+        grid = MazeGrid(self.width, self.height)
+        grid.start, grid.end = self.start, self.end
+        for prev_cell, cell, kind in zip(self.prev_cells, self.cells, self.kinds):
+            if kind == CARVE:
+                grid.add_edge(prev_cell, cell)
+                grid.visited[prev_cell] = grid.visited[cell] = 1
+        return grid
+
+    def save(self, file_path):
+        flags = FLAG_HAS_SEED if self.seed is not None else 0
+        with open(file_path, 'wb') as f:
+            f.write(STEP_LOG_HEADER.pack(STEP_LOG_MAGIC, STEP_LOG_VERSION, flags, self.width, self.height,
+                                         self.start, self.end, self.seed or 0, len(self)))
+            for cells in (self.prev_cells, self.cells):
+                if sys.byteorder == "big":
+                    cells = array('i', cells)
+                    cells.byteswap()
+                cells.tofile(f)
+            f.write(self.kinds)
+        return file_path
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if len(data) < STEP_LOG_HEADER.size:
+            raise ValueError(f"{file_path} is too short to be a step log")
+        magic, version, flags, width, height, start, end, seed, count = STEP_LOG_HEADER.unpack_from(data)
+        if magic != STEP_LOG_MAGIC:
+            raise ValueError(f"{file_path} is not a step log")
+        if version != STEP_LOG_VERSION:
+            raise ValueError(f"Unsupported step log version {version}")
+        if len(data) < STEP_LOG_HEADER.size + 9 * count:
+            raise ValueError(f"{file_path} is truncated")
+
+        log = cls(width, height, start, end, seed if flags & FLAG_HAS_SEED else None)
+        position = STEP_LOG_HEADER.size
+        for cells in (log.prev_cells, log.cells):
+            cells.frombytes(data[position:position + 4 * count])
+            if sys.byteorder == "big":
+                cells.byteswap()
+            position += 4 * count
+        log.kinds = bytearray(data[position:position + count])
+        return log
+
+def step_log_path(maze_file):
+    # The log sits next to the maze export with the same name
+    return os.path.splitext(maze_file)[0] + ".steps"
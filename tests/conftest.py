@@ -0,0 +1,22 @@
+#The modules live at the top of the repository, so the tests import them from there.
+#The generate fixture is the one way the tests build a maze.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generator import MazeGenerator
+
+@pytest.fixture(scope="session")
+def generate():
+    """
+    :return: Function (width, height, reach, bias, seed) -> MazeGenerator holding the finished maze
+    """
+    def generate(width, height, reach=25, bias=0, seed=1):
+        generator = MazeGenerator(width, height, reach, bias, seed)
+        generator.generate()
+        return generator
+    return generate
@@ -0,0 +1,86 @@
+#MazeCache: memory and disk round trips, eviction limits and the hit/miss counters.
+
+import pytest
+
+from cache import MazeCache, decode_png, encode_png
+from render import render_maze_image
+
+@pytest.fixture
+def maze(generate):
+    # A small maze per seed; every key the tests use is MazeCache.key(15, 15, 25, 10, seed)
+    return lambda seed: generate(15, 15, 25, 10, seed)
+
+def test_memory_round_trip(maze):
+    cache = MazeCache(cache_dir=None)
+    generator = maze(1)
+    key = MazeCache.key_for(generator)
+    assert cache.get(key) is None
+    cache.put(key, generator.grid, generator.seed)
+
+    # Slider values come in as floats or ints; both must find the same entry
+    entry = cache.get(MazeCache.key(15, 15, 25.0, 10.0, 1))
+    assert entry.grid is generator.grid and entry.seed == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_disk_round_trip(tmp_path, maze):
+    generator = maze(2)
+    key = MazeCache.key_for(generator)
+    image = render_maze_image(generator.grid, 8)
+    MazeCache(cache_dir=str(tmp_path)).put(key, generator.grid, generator.seed, encode_png(image), ("test", 8))
+
+    cache = MazeCache(cache_dir=str(tmp_path))
+    entry = cache.get(key)
+    assert entry.grid.edge_from == generator.grid.edge_from
+    assert entry.grid.edge_to == generator.grid.edge_to
+    assert (entry.grid.start, entry.grid.end, entry.seed) == (generator.grid.start, generator.grid.end, 2)
+    assert decode_png(cache.get_png(key, ("test", 8))).image.tobytes() == image.image.tobytes()
+    assert cache.get_png(key, ("test", 9)) is None
+    assert cache.stats()["disk_hits"] == 1
+
+def test_eviction_by_count_and_bytes(maze):
+    generators = [maze(seed) for seed in range(5)]
+
+    by_count = MazeCache(max_entries=3, cache_dir=None)
+    for generator in generators:
+        by_count.put(MazeCache.key_for(generator), generator.grid, generator.seed)
+    assert by_count.stats()["entries"] == 3 and by_count.stats()["evictions"] == 2
+    assert by_count.get(MazeCache.key_for(generators[0])) is None
+    assert by_count.get(MazeCache.key_for(generators[4])) is not None
+
+    by_bytes = MazeCache(max_bytes=1, cache_dir=None)
+    by_bytes.put(MazeCache.key_for(generators[0]), generators[0].grid, 0)
+    assert by_bytes.stats()["entries"] == 0 and by_bytes.total_bytes == 0
+
+def test_png_added_to_cached_maze_is_counted(maze):
+    generator = maze(1)
+    key = MazeCache.key_for(generator)
+    cache = MazeCache(max_bytes=50000, cache_dir=None)
+    entry = cache.put(key, generator.grid, generator.seed)
+    maze_bytes = entry.nbytes
+    assert cache.total_bytes == maze_bytes
+
+    cache.put(key, generator.grid, generator.seed, b"x" * 1000, ("test", 1))
+    assert cache.total_bytes == maze_bytes + 1000 and cache.stats()["entries"] == 1
+
+    # Growing past max_bytes through another PNG evicts it, and the count goes back to zero
+    cache.put(key, generator.grid, generator.seed, b"x" * 50000, ("test", 2))
+    assert cache.stats()["entries"] == 0 and cache.stats()["evictions"] == 1
+    assert cache.total_bytes == 0 and not cache.sizes
+
+def test_disk_tier_is_pruned_oldest_first(tmp_path, maze):
+    generators = [maze(seed) for seed in range(4)]
+    cache = MazeCache(cache_dir=str(tmp_path), max_disk_bytes=1)
+    (tmp_path / "peer.maze.123.tmp").write_bytes(b"x" * 100)  # Another process mid-write
+    for generator in generators:
+        cache.put(MazeCache.key_for(generator), generator.grid, generator.seed)
+
+    # A one-byte budget holds nothing, so each put prunes everything except the peer's temp file
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["peer.maze.123.tmp"]
+    assert cache.disk_bytes == 0
+
+    roomy = MazeCache(cache_dir=str(tmp_path), max_disk_bytes=2**20)
+    for generator in generators:
+        roomy.put(MazeCache.key_for(generator), generator.grid, generator.seed)
+    assert len(list(tmp_path.glob("*.maze"))) == 4
+    assert roomy.disk_bytes == sum(path.stat().st_size for path in tmp_path.glob("*.maze"))
+    assert roomy.puts_since_scan == 3  # Scanned once on the first put, then kept a running total
@@ -0,0 +1,51 @@
+#Round trips through the maze file formats: CSV and binary .maze must hand the solvers the same maze.
+
+import pytest
+
+from graph import read_maze_csv
+from load import export_maze_to_binary, export_maze_to_csv, read_maze_binary, read_maze_grid
+from solver import SOLVERS
+
+MAZES = [(23, 17, 40, 20, 4), (40, 30, 100, 0, 7), (30, 30, 25, 100, 9), (1, 12, 50, 0, 3)]
+
+def solve(name, graph):
+    return SOLVERS[name](None, None, None, graph=graph).solve()
+
+@pytest.mark.parametrize("maze", MAZES)
+@pytest.mark.parametrize("csr", [False, True])
+def test_formats_give_the_same_paths(tmp_path, generate, maze, csr):
+    generator = generate(*maze)
+    csv_graph = read_maze_csv(export_maze_to_csv(generator, "maze.csv", str(tmp_path)))
+    binary_file = export_maze_to_binary(generator, "maze.maze", str(tmp_path), csr=csr)
+    binary_graph = read_maze_binary(binary_file)
+
+    assert binary_graph.seed == csv_graph.seed == generator.seed
+    for name in SOLVERS:
+        path = solve(name, csv_graph)
+        assert path is not None
+        assert solve(name, binary_graph) == path
+
+@pytest.mark.parametrize("maze", MAZES)
+def test_read_maze_grid_round_trip(tmp_path, generate, maze):
+    generator = generate(*maze)
+    grid, seed = read_maze_grid(export_maze_to_binary(generator, "maze.maze", str(tmp_path)))
+
+    assert seed == generator.seed
+    assert (grid.width, grid.height, grid.start, grid.end) == (generator.width, generator.height,
+                                                               generator.grid.start, generator.grid.end)
+    assert grid.edge_from == generator.grid.edge_from
+    assert grid.edge_to == generator.grid.edge_to
+    # The loaded columns never went through add_edge, has_edge must still see every edge both ways
+    for a, b in generator.grid.iter_edges():
+        assert grid.has_edge(a, b) and grid.has_edge(b, a)
+    assert sum(grid.has_edge(a, a + 1) for a in range(grid.size - 1)) == \
+        sum(abs(a - b) == 1 for a, b in generator.grid.iter_edges())
+
+def test_truncated_binary_file_is_rejected(tmp_path, generate):
+    file_path = export_maze_to_binary(generate(*MAZES[0]), "maze.maze", str(tmp_path))
+    with open(file_path, "rb") as f:
+        data = f.read()
+    with open(file_path, "wb") as f:
+        f.write(data[:-4])
+    with pytest.raises(ValueError):
+        read_maze_binary(file_path)
@@ -0,0 +1,111 @@
+#The generator's fast paths must make the same decisions as the straightforward code they replaced.
+
+import pytest
+
+from generator import MazeGenerator
+from node import Edge
+
+MAZES = [(12, 9, 40, 20, 4), (15, 15, 100, 0, 7), (10, 14, 25, 100, 9), (1, 12, 50, 0, 3), (13, 1, 100, 50, 2)]
+
+def overlaps(grid, carved, cell1, cell2):
+    # The original add_edge: a corridor is refused if it shares any length with a carved one
+    new_edge = Edge(grid.node(cell1), grid.node(cell2))
+    return any(edge.is_sub_edge(new_edge) or new_edge.is_sub_edge(edge) for edge in carved)
+
+@pytest.mark.parametrize("maze", MAZES)
+def test_add_edge_matches_is_sub_edge(maze):
+    generator = MazeGenerator(*maze)
+    grid = generator.grid
+    carved = []
+    add_edge = generator.add_edge
+
+    def checked_add_edge(cell1, cell2):
+        assert add_edge(cell1, cell2) == (not overlaps(grid, carved, cell1, cell2))
+        return add_edge(cell1, cell2)
+
+    generator.add_edge = checked_add_edge
+    generator.generate(on_carve=lambda a, b: carved.append(Edge(grid.node(a), grid.node(b))))
+
+    # Generation mostly asks about corridors that fit, so also try every straight pair on the finished maze
+    refused = 0
+    for cell1 in range(grid.size):
+        x1, y1 = grid.coords(cell1)
+        for cell2 in range(cell1 + 1, grid.size):
+            x2, y2 = grid.coords(cell2)
+            if x1 == x2 or y1 == y2:
+                expected = not overlaps(grid, carved, cell1, cell2)
+                assert add_edge(cell1, cell2) == add_edge(cell2, cell1) == expected
+                refused += not expected
+    assert refused > 0
+
+def recursive_generate(width, height, reach, bias, seed):
+    # The DFS as it was before carve() kept its own stack, with the same helpers and random draws
+    generator = MazeGenerator(width, height, reach, bias, seed)
+    generator.choose_endpoints()
+    grid = generator.grid
+
+    def dfs(cell):
+        generator.visit(cell)
+        neighbors = generator.get_unvisited_neighbors(cell)
+        if generator.bias/100 > generator.random.random():
+            neighbors = generator.parallel_bias(neighbors)
+        for neighbor in neighbors:
+            if not grid.visited[neighbor] and generator.add_edge(neighbor, cell):
+                grid.add_edge(cell, neighbor)
+                generator.mark_segment(cell, neighbor)
+                dfs(neighbor)
+
+    dfs(grid.start)
+    return generator
+
+@pytest.mark.parametrize("maze", MAZES)
+def test_stack_dfs_carves_the_recursive_maze(generate, maze):
+    expected = recursive_generate(*maze).grid
+    grid = generate(*maze).grid
+    assert (grid.start, grid.end) == (expected.start, expected.end)
+    assert grid.edge_from == expected.edge_from
+    assert grid.edge_to == expected.edge_to
+    assert grid.visited == expected.visited
+
+@pytest.mark.parametrize("maze", MAZES)
+def test_neighbor_candidates_match_the_direction_scan(maze):
+    generator = MazeGenerator(*maze)
+    grid = generator.grid
+    carved = []
+    get_unvisited_neighbors = generator.get_unvisited_neighbors
+    directions = ([(dx, 0) for dx in range(-generator.reach_x, generator.reach_x)] +
+                  [(0, dy) for dy in range(-generator.reach_y, generator.reach_y)])
+
+    def checked_get_unvisited_neighbors(cell):
+        # The original scan: every direction within reach, in bounds, unvisited and not overlapping a corridor
+        x, y = grid.coords(cell)
+        expected = {grid.cell(x + dx, y + dy) for dx, dy in directions
+                    if 0 <= x + dx < grid.width and 0 <= y + dy < grid.height
+                    and not grid.visited[grid.cell(x + dx, y + dy)]
+                    and not overlaps(grid, carved, grid.cell(x + dx, y + dy), cell)}
+        neighbors = get_unvisited_neighbors(cell)
+        assert len(neighbors) == len(expected) and set(neighbors) == expected
+        return neighbors
+
+    generator.get_unvisited_neighbors = checked_get_unvisited_neighbors
+    generator.generate(on_carve=lambda a, b: carved.append(Edge(grid.node(a), grid.node(b))))
+
+@pytest.mark.parametrize("maze", MAZES)
+def test_parallel_bias_matches_the_sorted_count(maze):
+    generator = MazeGenerator(*maze[:3], 100, maze[4])  # Bias 100 so every step is reordered
+    grid = generator.grid
+    parallel_bias = generator.parallel_bias
+
+    def count_explored_neighbors(cell):
+        x, y = grid.coords(cell)
+        return sum(grid.visited[grid.cell(x + dx, y + dy)] for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                   if 0 <= x + dx < grid.width and 0 <= y + dy < grid.height)
+
+    def checked_parallel_bias(neighbors):
+        ordered = parallel_bias(neighbors)
+        assert ordered == sorted(neighbors, key=count_explored_neighbors, reverse=True)
+        return ordered
+
+    generator.parallel_bias = checked_parallel_bias
+    generator.generate()
+    assert list(generator.explored_neighbors) == [count_explored_neighbors(cell) for cell in range(grid.size)]
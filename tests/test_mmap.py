@@ -0,0 +1,18 @@
+#MappedMazeGraph solves straight from the file, so it must find exactly the paths the loaded graph finds.
+
+import pytest
+
+from load import MappedMazeGraph, export_maze_to_binary, read_maze_binary
+from solver import SOLVERS
+from test_formats import MAZES, solve
+
+@pytest.mark.parametrize("maze", MAZES)
+@pytest.mark.parametrize("csr", [False, True])
+def test_mapped_graph_gives_the_same_paths(tmp_path, generate, maze, csr):
+    binary_file = export_maze_to_binary(generate(*maze), "maze.maze", str(tmp_path), csr=csr)
+    binary_graph = read_maze_binary(binary_file)
+
+    with MappedMazeGraph(binary_file) as mapped_graph:
+        assert mapped_graph.seed == binary_graph.seed
+        for name in SOLVERS:
+            assert solve(name, mapped_graph) == solve(name, binary_graph)
@@ -0,0 +1,26 @@
+#The streaming PNG writer must produce exactly the pixels of a whole render_maze_image.
+
+import pytest
+from PIL import Image
+
+from render import export_maze_png_streaming, render_maze_image
+
+np = pytest.importorskip("numpy")
+
+@pytest.fixture(scope="module")
+def grid(generate):
+    return generate(23, 17, 60, 30, 5).grid
+
+@pytest.mark.parametrize("cell_size", [1, 3, 7, 20])
+@pytest.mark.parametrize("mode", ["rgb", "palette"])
+@pytest.mark.parametrize("strip_height", [1, 16, 256])
+def test_streamed_png_matches_render(tmp_path, grid, cell_size, mode, strip_height):
+    expected = render_maze_image(grid, cell_size).image
+    file_path = export_maze_png_streaming(grid, str(tmp_path / "maze.png"), cell_size, mode=mode,
+                                          strip_height=strip_height)
+    assert Image.open(file_path).convert("RGB").tobytes() == expected.tobytes()
+
+def test_1bit_png_matches_render_in_black_and_white(tmp_path, grid):
+    expected = render_maze_image(grid, 5).image.convert("L").point(lambda value: 255 if value else 0)
+    file_path = export_maze_png_streaming(grid, str(tmp_path / "maze.png"), 5, mode="1bit")
+    assert Image.open(file_path).convert("L").tobytes() == expected.tobytes()
@@ -0,0 +1,37 @@
+#A step log must survive a save/load round trip and rebuild exactly the maze it recorded.
+
+import pytest
+
+from generator import MazeGenerator
+from steplog import BACKTRACK, CARVE, StepLog
+from test_generator import MAZES
+
+@pytest.mark.parametrize("maze", MAZES)
+def test_step_log_round_trip(tmp_path, generate, maze):
+    generator = MazeGenerator(*maze)
+    log = StepLog.record(generator)
+    assert log.kinds.count(CARVE) == generator.grid.edge_count()
+    assert set(log.kinds) <= {CARVE, BACKTRACK}
+
+    loaded = StepLog.load(log.save(str(tmp_path / "maze.steps")))
+    assert (loaded.width, loaded.height, loaded.start, loaded.end, loaded.seed) == \
+        (log.width, log.height, log.start, log.end, maze[4])
+    assert list(loaded) == list(log)
+
+    # Recording doesn't change the maze, and replaying the carves rebuilds it
+    expected = generate(*maze).grid
+    grid = loaded.to_grid()
+    assert (grid.start, grid.end) == (expected.start, expected.end)
+    assert grid.edge_from == expected.edge_from == generator.grid.edge_from
+    assert grid.edge_to == expected.edge_to
+    assert grid.visited == expected.visited
+    assert all(grid.has_edge(b, a) for a, b in expected.iter_edges())
+
+def test_truncated_step_log_is_rejected(tmp_path):
+    file_path = StepLog.record(MazeGenerator(*MAZES[0])).save(str(tmp_path / "maze.steps"))
+    with open(file_path, "rb") as f:
+        data = f.read()
+    with open(file_path, "wb") as f:
+        f.write(data[:-1])
+    with pytest.raises(ValueError):
+        StepLog.load(file_path)
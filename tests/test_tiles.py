@@ -0,0 +1,25 @@
+#Tiled PNG export must cut exactly the pixels of a whole render_maze_image into tiles.
+
+import os
+
+import pytest
+from PIL import Image
+
+from render import export_maze_image, render_maze_image
+
+@pytest.fixture(scope="module")
+def grid(generate):
+    return generate(23, 17, 60, 30, 5).grid
+
+@pytest.mark.parametrize("cell_size", [2, 9])
+def test_tiles_stitch_back_into_the_render(tmp_path, grid, cell_size):
+    expected = render_maze_image(grid, cell_size).image
+    tile_size = 37
+    files = export_maze_image(grid, str(tmp_path / "maze.png"), cell_size, tile_size=tile_size)
+    assert len(files) > 1
+
+    stitched = Image.new("RGB", expected.size)
+    for file_path in files:
+        row, column = os.path.basename(file_path)[len("maze_r"):-len(".png")].split("_c")
+        stitched.paste(Image.open(file_path), (int(column) * tile_size, int(row) * tile_size))
+    assert stitched.tobytes() == expected.tobytes()
@@ -4,24 +4,46 @@
 
 import tkinter as tk
 import tkinter.messagebox
+import tkinter.simpledialog
 import tkinter.ttk as ttk
+import os
+from datetime import datetime
+from tkinter import filedialog
+from cache import MazeCache, decode_png, encode_png
 from maze import MazeAlgorithm
-from node import Node
-from load import export_maze_to_csv, export_maze_to_png, import_maze_from_csv
+from profiling import profiler
+from replay import ReplayPlayer
+from steplog import StepLog, step_log_path
+from load import SEED_RANGE, export_maze_to_binary, export_maze_to_csv, export_maze_to_png, import_maze_from_csv
+from render import DEFAULT_PIXELS_PER_CELL, export_maze_image
 
 class MazeGeneratorUI:
+    # Solve dropdown entries and the solver (see solver.SOLVERS) each one runs
+    SOLVE_OPTIONS = {"BFS": "bfs", "DFS": "dfs", "A*": "astar", "BiBFS": "bidirectional"}
+    # Animation dropdown entries and the MazeAlgorithm.animation_mode each one selects
+    ANIMATION_OPTIONS = {"Background": "background", "Replay": "replay",
+                         "Live": "coords", "Live (original)": "rectangles"}
+
     def __init__(self, master):
         self.master = master
         master.title("Spaghetti Supper")
 
+        # Solver whose animation is running, if any
+        self.current_solver = None
+        # Player animating the last generated (or loaded) step log, if any
+        self.replay_player = None
+        # Mazes generated this session (and earlier ones on disk), keyed by their settings and seed
+        self.maze_cache = MazeCache()
+
         self._create_config_frame()
+        self._create_replay_frame()
         self._create_canvas_frame()
         self._setup_zoom_pan()
         self.current_maze_algorithm = None
 
         # Flag to track maze generation
         self.maze_generating = False
-        self.export_dropdown['values'] = ["CSV", "PNG"]
+        self.export_dropdown['values'] = ["CSV", "Binary", "PNG", "PNG (full size)"]
 
     #Owen and Max added a few sliders and buttons over time by modifying this method:
     def _create_config_frame(self):
@@ -36,6 +58,10 @@ class MazeGeneratorUI:
         tk.Label(self.config_frame, text="Height:").pack(side=tk.LEFT, padx=(10, 0))
         self.height_entry = self._create_entry(default="10")
 
+        # Seed Input (left blank for a random seed)
+        tk.Label(self.config_frame, text="Seed:").pack(side=tk.LEFT, padx=(10, 0))
+        self.seed_entry = self._create_entry(default="")
+
         # Delay Slider
         tk.Label(self.config_frame, text="Speed (%):").pack(side=tk.LEFT, padx=(10, 0))
         self.speed_var = tk.DoubleVar(value=15)
@@ -96,13 +122,20 @@ class MazeGeneratorUI:
         self.solve_dropdown = ttk.Combobox(
             self.config_frame,
             textvariable=self.solve_menu,
-            values=["BFS", "DFS"],
+            values=list(self.SOLVE_OPTIONS),
             state="readonly",
-            width=5
+            width=7
         )
         self.solve_dropdown.pack(side=tk.LEFT, padx=(10, 0))
         self.solve_dropdown.bind('<<ComboboxSelected>>', self.solve_selected)
 
+        # Skip Button (finishes the solve or replay animation right away)
+        self.skip_btn = tk.Button(
+            self.config_frame, text="Skip",
+            command=self.skip_solve
+        )
+        self.skip_btn.pack(side=tk.LEFT, padx=(10, 0))
+
         # Status Banner
         self.status_banner = tk.Label(
             self.config_frame,
@@ -114,27 +147,142 @@ class MazeGeneratorUI:
             pady=5
         )
 
+    def _create_replay_frame(self):
+        self.replay_frame = tk.Frame(self.master)
+        self.replay_frame.pack(side=tk.TOP, fill=tk.X, padx=10)
+
+        self.replay_btn = tk.Button(
+            self.replay_frame, text="Play/Pause",
+            command=self.toggle_replay
+        )
+        self.replay_btn.pack(side=tk.LEFT)
+
+        # Scrub bar: dragging it seeks the replay to that step
+        self.replay_var = tk.IntVar(value=0)
+        self.replay_scale = tk.Scale(
+            self.replay_frame, from_=0, to=0,
+            orient=tk.HORIZONTAL, showvalue=False,
+            variable=self.replay_var, command=self._on_scrub, length=400
+        )
+        self.replay_scale.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+
+        self.load_replay_btn = tk.Button(
+            self.replay_frame, text="Load Replay",
+            command=self.load_replay
+        )
+        self.load_replay_btn.pack(side=tk.LEFT, padx=(10, 0))
+
+        # How the next Generate is animated (see MazeAlgorithm.generate_maze)
+        tk.Label(self.replay_frame, text="Animation:").pack(side=tk.LEFT, padx=(10, 0))
+        self.animation_var = tk.StringVar(value="Background")
+        self.animation_dropdown = ttk.Combobox(
+            self.replay_frame,
+            textvariable=self.animation_var,
+            values=list(self.ANIMATION_OPTIONS),
+            state="readonly",
+            width=14
+        )
+        self.animation_dropdown.pack(side=tk.LEFT, padx=5)
+
     #Owen added this method with help from ChatGPT:
     def solve_selected(self, event):
         solve_type = self.solve_menu.get()
-        if solve_type == "BFS":
-            import_maze_from_csv(self, "bfs", True)
-        elif solve_type == "DFS":
-            import_maze_from_csv(self, "dfs", True)
+        if solve_type in self.SOLVE_OPTIONS:
+            import_maze_from_csv(self, self.SOLVE_OPTIONS[solve_type], True)
 
         # Reset dropdown
         self.solve_menu.set("Solve")
 
+    def skip_solve(self):
+        if self.current_solver:
+            self.current_solver.skip_to_result()
+        elif self.replay_player:
+            self.replay_player.seek(len(self.replay_player.log))
+            self.replay_player.pause()
+
+    def start_replay(self, maze):
+        self.stop_replay()
+        self.replay_player = ReplayPlayer(maze, maze.step_log, on_position=self._replay_moved)
+        self.replay_scale.configure(to=len(maze.step_log))
+        self.replay_player.play()
+
+    def stop_replay(self):
+        if self.replay_player:
+            self.replay_player.stop()
+            self.replay_player = None
+
+    def toggle_replay(self):
+        if self.replay_player:
+            self.replay_player.toggle()
+
+    def _replay_moved(self, position):
+        # The log may still be growing while a background generation runs
+        self.replay_scale.configure(to=len(self.replay_player.log))
+        self.replay_var.set(position)
+
+    def _on_scrub(self, value):
+        # The scale also reports the player's own updates; only real drags seek
+        if self.replay_player and int(float(value)) != self.replay_player.position:
+            self.replay_player.seek(int(float(value)))
+
+    def load_replay(self):
+        """Replays a saved .steps log without generating the maze again"""
+        file_path = filedialog.askopenfilename(
+            title="Select Step Log to Replay",
+            filetypes=[("Step logs", "*.steps"), ("All files", "*.*")],
+            initialdir='./maze_exports'
+        )
+        if not file_path:
+            return
+        try:
+            log = StepLog.load(file_path)
+        except Exception as e:
+            tk.messagebox.showerror("Replay Error", str(e))
+            return
+
+        self.stop_solve()
+        self.stop_replay()
+        if self.current_maze_algorithm:
+            # A generation still running in the background would otherwise finish into the replayed maze
+            self.current_maze_algorithm.cancel()
+            self.maze_generating = False
+            try:
+                self.status_banner.pack_forget()
+            except:
+                pass
+        self.canvas.delete("all")
+        self.current_maze_algorithm = MazeAlgorithm(
+            self, log.width, log.height,
+            canvas_width=self.canvas.winfo_width(),
+            canvas_height=self.canvas.winfo_height()
+        )
+        self.current_maze_algorithm.use_step_log(log)
+        self.start_replay(self.current_maze_algorithm)
+
+    def stop_solve(self):
+        # Stops a running solve animation before the canvas gets cleared
+        if self.current_solver:
+            self.current_solver.stop()
+            self.current_solver = None
+
     def import_maze(self):
         import_maze_from_csv(self,"dfs")
 
     def export_selected(self, event):
         """Handle export based on selected option"""
         export_type = self.export_menu.get()
+        if self.maze_generating:
+            tk.messagebox.showerror("Error", "Wait for the maze to finish generating!")
+            self.export_menu.set("Export")
+            return
         if export_type == "CSV":
             self.export_maze_csv()
+        elif export_type == "Binary":
+            self.export_maze_binary()
         elif export_type == "PNG":
             self.export_maze_png()
+        elif export_type == "PNG (full size)":
+            self.export_maze_png_full_size()
 
         # Reset dropdown
         self.export_menu.set("Export")
@@ -148,12 +296,31 @@ class MazeGeneratorUI:
         try:
             # Export maze and get filepath
             filepath = export_maze_to_csv(self.current_maze_algorithm)
+            self._save_step_log(filepath)
 
             # Show export success banner
             self._show_banner(f"Exported maze to {filepath}", bg_color='green')
         except Exception as e:
             tk.messagebox.showerror("Export Error", str(e))
 
+    def _save_step_log(self, maze_file):
+        # The replay log goes next to the export, so the maze can be re-animated later
+        if self.current_maze_algorithm.step_log is not None:
+            self.current_maze_algorithm.step_log.save(step_log_path(maze_file))
+
+    def export_maze_binary(self):
+        """Export maze to the compact binary format"""
+        if not self.current_maze_algorithm:
+            tk.messagebox.showerror("Error", "Generate a maze first!")
+            return
+
+        try:
+            filepath = export_maze_to_binary(self.current_maze_algorithm)
+            self._save_step_log(filepath)
+            self._show_banner(f"Exported maze to {filepath}", bg_color='green')
+        except Exception as e:
+            tk.messagebox.showerror("Export Error", str(e))
+
     def export_maze_png(self):
         """Export maze to PNG"""
         if not self.current_maze_algorithm:
@@ -169,6 +336,31 @@ class MazeGeneratorUI:
         except Exception as e:
             tk.messagebox.showerror("Export Error", str(e))
 
+    def export_maze_png_full_size(self):
+        """Export the maze to PNG at a chosen cell size instead of the canvas size"""
+        if not self.current_maze_algorithm:
+            tk.messagebox.showerror("Error", "Generate a maze first!")
+            return
+
+        pixels_per_cell = tk.simpledialog.askinteger(
+            "Full size PNG", "Pixels per cell:",
+            initialvalue=DEFAULT_PIXELS_PER_CELL, minvalue=1, parent=self.master)
+        if pixels_per_cell is None:
+            return
+
+        try:
+            os.makedirs('maze_exports', exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filepath = os.path.join('maze_exports', f'maze_export_{timestamp}.png')
+            files = export_maze_image(self.current_maze_algorithm.grid, filepath, pixels_per_cell)
+
+            if len(files) == 1:
+                self._show_banner(f"Maze PNG exported to {files[0]}", bg_color='green')
+            else:
+                self._show_banner(f"Maze PNG exported as {len(files)} tiles next to {filepath}", bg_color='green')
+        except Exception as e:
+            tk.messagebox.showerror("Export Error", str(e))
+
     #Max edited this method when adding CSV loading functionality (the "load" parameter)
     def generate_maze(self, load=False):
         # Clear any existing banners
@@ -179,6 +371,11 @@ class MazeGeneratorUI:
 
         # Set generation flag
         self.maze_generating = True
+        self.stop_solve()
+        self.stop_replay()
+        if self.current_maze_algorithm:
+            # Pressing Generate again cancels a generation that is still running
+            self.current_maze_algorithm.cancel()
 
         # Clear canvas
         self.canvas.delete("all")
@@ -186,8 +383,12 @@ class MazeGeneratorUI:
         try:
             width = int(self.width_entry.get())
             height = int(self.height_entry.get())
+            seed = int(self.seed_entry.get()) if self.seed_entry.get().strip() else None
+            if seed is not None and seed not in SEED_RANGE:
+                # Anything bigger couldn't be written to the binary exports, the step log or the cache
+                raise ValueError(seed)
         except ValueError:
-            tk.messagebox.showerror("Error", "Please enter valid width and height")
+            tk.messagebox.showerror("Error", "Please enter valid width, height and seed")
             self.maze_generating = False
             return
 
@@ -199,16 +400,47 @@ class MazeGeneratorUI:
         self.current_maze_algorithm = MazeAlgorithm(
             self, width, height,
             canvas_width=window_width,
-            canvas_height=window_height
+            canvas_height=window_height,
+            seed=seed
         )
+        self.current_maze_algorithm.animation_mode = self.ANIMATION_OPTIONS[self.animation_var.get()]
 
         if load:
             return
 
-        # Show generation banner
+        # A seed that was generated before comes straight out of the cache
+        if seed is not None and self._use_cached_maze(self.current_maze_algorithm):
+            return
+
+        # Show generation banner; it comes down in maze_generation_complete once the worker thread is done
         self._show_banner("Generating maze...", bg_color='blue')
-        grid = [[Node(x, y) for x in range(self.current_maze_algorithm.width)] for y in range(self.current_maze_algorithm.height)]
-        self.current_maze_algorithm.generate_maze(grid)
+        maze = self.current_maze_algorithm
+        maze.generate_maze(on_done=lambda: self._maze_generated(maze))
+
+        # Phase two: animate the logged steps
+        if self.current_maze_algorithm.step_log is not None:
+            self.start_replay(self.current_maze_algorithm)
+
+    def _use_cached_maze(self, maze):
+        key = MazeCache.key_for(maze.generator)
+        cached = self.maze_cache.get(key)
+        if cached is None:
+            return False
+        png = self.maze_cache.get_png(key, maze.render_settings)
+        maze.use_cached(cached.grid, decode_png(png) if png is not None else None)
+        if png is None:
+            self.maze_cache.put(key, cached.grid, cached.seed, encode_png(maze.image), maze.render_settings)
+        print(f"Maze loaded from cache (seed {maze.seed}). {self.maze_cache.summary()}")
+        self.maze_generation_complete()
+        return True
+
+    def _maze_generated(self, maze):
+        # Remember the new maze (and its canvas-sized image) for the next time these settings come up.
+        # A maze that has been replaced in the meantime (Generate, Load Replay, import) is left alone.
+        if maze is not self.current_maze_algorithm:
+            return
+        self.maze_cache.put(MazeCache.key_for(maze.generator), maze.grid, maze.seed,
+                            encode_png(maze.image), maze.render_settings)
         self.maze_generation_complete()
 
     def maze_generation_complete(self):
@@ -222,6 +454,8 @@ class MazeGeneratorUI:
         except:
             pass
 
+        profiler.report_run("generation")
+
     def _create_canvas_frame(self):
         self.canvas_frame = tk.Frame(self.master)
         self.canvas_frame.pack(expand=True, fill=tk.BOTH)
@@ -273,10 +507,17 @@ class MazeGeneratorUI:
         entry.pack(side=tk.LEFT, padx=5)
         return entry
 
+    def _drawing(self):
+        # Items drawn after canvas.scale('all') land unscaled, so zoom and pan wait for the generation
+        # and for any solve or replay animation that is still adding items (a paused replay included)
+        return (self.maze_generating
+                or (self.current_solver is not None and self.current_solver.animating)
+                or (self.replay_player is not None and not self.replay_player.finished))
+
     def _on_mousewheel(self, event):
-        # Prevent zooming during maze generation
-        if self.maze_generating:
-            self._show_banner("Wait for maze generation before zooming/panning")
+        # Prevent zooming while anything is still being drawn
+        if self._drawing():
+            self._show_banner("Wait for the maze to finish drawing before zooming/panning")
             return
 
         # Zoom logic with more precise scaling
@@ -290,17 +531,17 @@ class MazeGeneratorUI:
         self.canvas.scale('all', x, y, scale_factor, scale_factor)
 
     def _on_pan_start(self, event):
-        # Prevent panning during maze generation
-        if self.maze_generating:
-            self._show_banner("Wait for maze generation before zooming/panning")
+        # Prevent panning while anything is still being drawn
+        if self._drawing():
+            self._show_banner("Wait for the maze to finish drawing before zooming/panning")
             return
 
         # Record the start point of pan
         self.canvas.scan_mark(event.x, event.y)
 
     def _on_pan_motion(self, event):
-        # Prevent panning during maze generation
-        if self.maze_generating:
+        # Prevent panning while anything is still being drawn
+        if self._drawing():
             return
 
         # Pan the canvas
@@ -0,0 +1,107 @@
+#This file runs slow work (generating, solving) on a worker thread so the Tk main loop never waits for it.
+#The worker hands events back through a queue.Queue in batches; an after() poller on the Tk side drains them,
+#so Tk is only ever touched from its own thread. A job can be cancelled at any point.
+
+import queue
+import threading
+
+class JobCancelled(Exception):
+    pass
+
+class BackgroundJob:
+    POLL_MS = 16                 # How often the Tk side drains the queue
+    BATCH_SIZE = 256             # Events the worker groups into one queue item
+    MAX_EVENTS_PER_POLL = 20000  # Events handed to on_events per poll, so a flood can't stall Tk
+
+    def __init__(self, master, work, on_events=None, on_done=None, on_error=None):
+        """
+        Args:
+            master: Tk widget whose after() runs the poller.
+            work (callable): Runs on the worker thread as work(job); may call job.emit(event)
+                and job.check_cancelled(). Its return value goes to on_done.
+            on_events (callable, optional): Called on the Tk thread with a list of emitted events.
+            on_done (callable, optional): Called on the Tk thread with work's result, after every event.
+            on_error (callable, optional): Called on the Tk thread with the exception if work raised one;
+                without it the exception is re-raised inside the Tk callback.
+        """
+        self.master = master
+        self.work = work
+        self.on_events = on_events
+        self.on_done = on_done
+        self.on_error = on_error
+
+        self.queue = queue.Queue()
+        self.cancelled = threading.Event()
+        self.finished = False
+        self._batch = []
+        self._after_id = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self._after_id = self.master.after(self.POLL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        """Stops the job; the worker notices at its next emit() or check_cancelled()."""
+        self.cancelled.set()
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
+    # Worker thread side
+
+    def check_cancelled(self):
+        if self.cancelled.is_set():
+            raise JobCancelled()
+
+    def emit(self, event):
+        self.check_cancelled()
+        self._batch.append(event)
+        if len(self._batch) >= self.BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            self.queue.put(("events", self._batch))
+            self._batch = []
+
+    def _run(self):
+        try:
+            result = self.work(self)
+        except JobCancelled:
+            return
+        except Exception as e:
+            self._flush()
+            self.queue.put(("error", e))
+            return
+        self._flush()
+        self.queue.put(("done", result))
+
+    # Tk thread side
+
+    def _poll(self):
+        self._after_id = None
+        handed = 0
+        while handed < self.MAX_EVENTS_PER_POLL and not self.cancelled.is_set():
+            try:
+                kind, payload = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "events":
+                if self.on_events is not None:
+                    self.on_events(payload)
+                handed += len(payload)
+            elif kind == "done":
+                self.finished = True
+                if self.on_done is not None:
+                    self.on_done(payload)
+                return
+            else:
+                self.finished = True
+                if self.on_error is None:
+                    raise payload
+                self.on_error(payload)
+                return
+        if not self.cancelled.is_set():
+            self._after_id = self.master.after(self.POLL_MS, self._poll)